@@ -7,16 +7,57 @@ to enhance search and retrieval capabilities with multi-step reasoning.
 
 import os
 import json
+import time
 import asyncio
-from typing import List, Dict, Any, Optional
+import threading
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
-from openai import OpenAI
+from openai import AsyncOpenAI
 from core.base import BaseAgent
 from core.schema import AgentRequest, AgentResponse
 from tools.mcp_base import MCPBase
+from tools.server_manager import (
+    build_tool_name_index,
+    format_tools_for_openai,
+    truncate_tool_result,
+)
 from ui.status_manager import get_status_manager
 from memory.sequential import SequentialMemory
 from core.logger import get_logger
+from core.openai_client import get_async_client, prompt_cache_kwargs
+
+# Background event loop shared by synchronous ``inference`` calls
+_BACKGROUND_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_BACKGROUND_LOOP_LOCK = threading.Lock()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the persistent event loop used to run synchronous inference.
+
+    The loop is started lazily in a daemon thread and lives for the rest of
+    the process, so LLM connection pools and MCP state survive across calls
+    instead of being torn down by ``asyncio.run`` each time. uvloop is used
+    when installed.
+
+    Returns:
+        Running event loop owned by the background thread
+    """
+    global _BACKGROUND_LOOP
+    with _BACKGROUND_LOOP_LOCK:
+        if _BACKGROUND_LOOP is None:
+            try:
+                import uvloop
+
+                loop = uvloop.new_event_loop()
+            except ImportError:
+                # uvloop is unavailable (e.g. on Windows), use the stdlib loop
+                loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="mcp-agent-loop", daemon=True
+            ).start()
+            _BACKGROUND_LOOP = loop
+        return _BACKGROUND_LOOP
 
 
 class MCPBaseAgent(BaseAgent):
@@ -36,7 +77,7 @@ class MCPBaseAgent(BaseAgent):
         model_name: LLM model to use for inference
         system_prompt: System prompt for the LLM
         max_tool_call: Maximum number of tool calls per query
-        client: OpenAI-compatible API client
+        client: Async OpenAI-compatible API client
         mcp_base: MCPBase component for tool communication
         memory: SequentialMemory for conversation management
         logger: Logger instance
@@ -61,6 +102,10 @@ class MCPBaseAgent(BaseAgent):
         max_tool_call: int = 5,
         base_url: Optional[str] = None,
         api_key: Optional[str] = None,
+        tools_ttl: float = 60.0,
+        memoize_servers: Optional[List[str]] = None,
+        max_context_tokens: Optional[int] = None,
+        max_tool_result_chars: Optional[int] = None,
     ):
         """
         Initialize the MCPBaseAgent.
@@ -73,6 +118,13 @@ class MCPBaseAgent(BaseAgent):
             max_tool_call: Maximum tool calls allowed per query
             base_url: Optional base URL for LLM API (default: from env BASE_URL)
             api_key: Optional API key (default: from env OPENAI_API_KEY)
+            tools_ttl: Seconds to reuse discovered MCP tools before rediscovering
+            memoize_servers: MCP servers whose tool results may be reused for
+                identical calls until the history is cleared
+            max_context_tokens: Optional token budget for the conversation
+                history; the oldest turns are dropped once it is exceeded
+            max_tool_result_chars: Optional cap on the characters of each tool
+                result kept in the conversation history
 
         Raises:
             ValueError: If required configuration is missing
@@ -82,35 +134,81 @@ class MCPBaseAgent(BaseAgent):
         self.model_name = model_name
         self.system_prompt = system_prompt
         self.max_tool_call = int(max_tool_call)
+        self.max_tool_result_chars = max_tool_result_chars
 
         # Initialize memory component
-        self.memory = SequentialMemory(system_prompt=system_prompt)
+        self.memory = SequentialMemory(
+            system_prompt=system_prompt, max_context_tokens=max_context_tokens
+        )
 
         # Setup result directory
         self.time_stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
 
         # Initialize LLM client
         self.base_url = base_url or os.environ.get("BASE_URL")
-        api_key = api_key or os.environ.get("OPENAI_API_KEY")
-        if not api_key:
+        self._api_key = api_key or os.environ.get("OPENAI_API_KEY")
+        if not self._api_key:
             raise ValueError(
                 "API key not found. Please set OPENAI_API_KEY environment variable."
             )
 
-        self.client: OpenAI = OpenAI(api_key=api_key, base_url=self.base_url)
-
         # Initialize MCP communication component
-        self.mcp_base = MCPBase(config_path=server_config_path)
+        self.mcp_base = MCPBase(
+            config_path=server_config_path, memoize_servers=memoize_servers
+        )
         self.available_tools = []
+        self.tools_store: Dict[str, Any] = {}
+        # Short tool name -> "server:tool", rebuilt on every discovery
+        self._tool_names: Dict[str, str] = {}
+        # Prompt-caching hint for the stable system prompt + tools prefix
+        self._prompt_cache_kwargs: Dict[str, Any] = {}
+
+        # Tool discovery cache: (discovered_at, tools, available_tools)
+        self.tools_ttl = float(tools_ttl)
+        self._tools_cache: Optional[
+            Tuple[float, Dict[str, Any], List[Dict[str, Any]]]
+        ] = None
+        # Set when the pinned MCP connections should be dropped and reopened
+        # before the next query (failed or partial discovery, invalidation)
+        self._reconnect_mcp = False
 
         # Setup logger
         self.logger = get_logger(__name__)
         self.logger.info(f"{self.name} initialized with model: {self.model_name}")
 
+    @property
+    def client(self) -> AsyncOpenAI:
+        """Shared AsyncOpenAI client for this agent's endpoint."""
+        return get_async_client(self.base_url, self._api_key)
+
     def inference(self, request: AgentRequest) -> AgentResponse:
         """
         Execute agent inference with MCP tool enhancement.
 
+        Synchronous entry point that runs ``ainference`` on a persistent
+        background event loop. Async callers (e.g. FastAPI routes) should
+        await ``ainference`` directly.
+
+        Args:
+            request: AgentRequest containing prompt and optional metadata
+
+        Returns:
+            AgentResponse with status, generated answer, and execution metadata
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            self.ainference(request), _get_background_loop()
+        )
+        try:
+            return future.result()
+        except BaseException:
+            # e.g. KeyboardInterrupt in the CLI: stop the in-flight query
+            future.cancel()
+            raise
+
+    async def ainference(self, request: AgentRequest) -> AgentResponse:
+        """
+        Execute agent inference asynchronously with MCP tool enhancement.
+
         This method processes the user prompt through the LLM with access to
         MCP tools. It handles multi-turn reasoning, tool calling, and response
         generation according to the configured parameters.
@@ -120,20 +218,14 @@ class MCPBaseAgent(BaseAgent):
 
         Returns:
             AgentResponse with status, generated answer, and execution metadata
-
-        Raises:
-            RuntimeError: If inference execution fails
         """
         # Extract configuration from metadata
         max_iterations = request.metadata.get("max_iterations", self.max_tool_call)
 
         try:
-            # Run async processing
-            result = asyncio.run(
-                self._process_query_async(
-                    user_message=request.prompt,
-                    max_iterations=max_iterations,
-                )
+            result = await self._process_query_async(
+                user_message=request.prompt,
+                max_iterations=max_iterations,
             )
 
             # Build response metadata
@@ -164,6 +256,10 @@ class MCPBaseAgent(BaseAgent):
         """
         Process user query asynchronously with MCP tool support.
 
+        Each round offers the tools to the LLM and returns as soon as a round
+        produces no tool calls. Only when every round called tools is one
+        extra, tool-free completion issued to summarize the gathered results.
+
         Args:
             user_message: User input query
             max_iterations: Maximum tool call iterations
@@ -171,24 +267,8 @@ class MCPBaseAgent(BaseAgent):
         Returns:
             Dictionary containing answer and metadata
         """
-        # Discover available tools using MCPBase component
-        tools = await self.mcp_base.list_tools()
-        self.logger.info(f"Available tools nums: {len(list(tools.keys()))}")
-        self.logger.info(f"Available tools: {list(tools.keys())}")
-        self.tools_store = tools
-
-        # Format tools for LLM (OpenAI Format)
-        available_tools = [
-            {
-                "type": "function",
-                "function": {
-                    "name": tool.get("name"),
-                    "description": tool.get("description"),
-                    "input_schema": tool.get("input_schema"),
-                },
-            }
-            for tool in list(tools.values())
-        ]
+        # Open MCP connections and discover available tools (cached across queries)
+        tools, available_tools = await self._prepare_tools()
 
         # Add user message to memory
         self.memory.add({"role": "user", "content": user_message})
@@ -196,35 +276,40 @@ class MCPBaseAgent(BaseAgent):
         tools_called = []
         final_answer = ""
 
+        # Live view of memory: entries added below are appended in place,
+        # so the list is fetched once instead of once per round
+        messages = self.memory.get_view("chat_messages")
+
         try:
             for round_count in range(max_iterations):
                 self.logger.info(f"Processing round {round_count + 1}/{max_iterations}")
 
-                # Get current messages from memory
-                messages = self.memory.get_view("chat_messages")
-
-                # Get LLM response
-                completion = self.client.chat.completions.create(
-                    model=self.model_name, messages=messages, tools=available_tools
-                )
-
-                tool_call_lists = completion.choices[0].message.tool_calls
-                has_tool_calls = (
-                    tool_call_lists is not None and len(tool_call_lists) > 0
+                # Stream LLM response, dispatching tool calls as they complete
+                content, tool_calls, tool_tasks = await self._stream_round(
+                    messages, available_tools, tools
                 )
 
                 # Check for tool calls
-                if has_tool_calls:
+                if tool_calls:
                     # Add assistant message to memory
-                    self.memory.add(completion.choices[0].message.model_dump())
-
-                    # Execute tool calls using MCPBase component
-                    tool_results = await self.mcp_base.execute_tool_calls(
-                        tool_call_lists, tools
+                    assistant_message = {"role": "assistant", "tool_calls": tool_calls}
+                    if content:
+                        assistant_message["content"] = content
+                    self.memory.add(assistant_message)
+
+                    # Collect tool results in the order the LLM requested them;
+                    # if collection fails, don't leave sibling calls running
+                    try:
+                        outcomes = await asyncio.gather(*tool_tasks)
+                    except BaseException:
+                        for task in tool_tasks:
+                            task.cancel()
+                        raise
+
+                    tools_called.extend(outcome["tool_used"] for outcome in outcomes)
+                    self.memory.add_many(
+                        [self._bounded_tool_message(outcome["history"]) for outcome in outcomes]
                     )
-
-                    tools_called.extend(tool_results["tools_used"])
-                    self.memory.add_many(tool_results["history"])
                     continue
 
                 else:
@@ -233,7 +318,7 @@ class MCPBaseAgent(BaseAgent):
                     status_mgr = get_status_manager()
                     status_mgr.set_summarizing("Generating final response...")
 
-                    final_answer = completion.choices[0].message.content
+                    final_answer = content
                     self.memory.add({"role": "assistant", "content": final_answer})
 
                     status_mgr.clear()
@@ -261,12 +346,196 @@ class MCPBaseAgent(BaseAgent):
             self.logger.error(error_message, exc_info=True)
             raise RuntimeError(error_message)
 
+    def _bounded_tool_message(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Cap a tool result message at max_tool_result_chars before it enters memory.
+
+        Args:
+            message: Tool message in OpenAI format
+
+        Returns:
+            The message, with its content truncated if it is too long
+        """
+        if not self.max_tool_result_chars:
+            return message
+        return {
+            **message,
+            "content": truncate_tool_result(
+                message["content"], self.max_tool_result_chars
+            ),
+        }
+
+    async def _stream_round(
+        self,
+        messages: List[Dict[str, Any]],
+        available_tools: List[Dict[str, Any]],
+        tools: Dict[str, Any],
+    ) -> Tuple[str, List[Dict[str, Any]], List[asyncio.Task]]:
+        """
+        Run one streaming LLM round and start tool calls as soon as possible.
+
+        Tool calls are streamed one after another, so a call's arguments are
+        complete once the next call starts (or the stream ends). Each complete
+        call is dispatched to MCPBase immediately, overlapping tool execution
+        with the rest of the generation.
+
+        Args:
+            messages: Conversation messages to send
+            available_tools: Tools in OpenAI format
+            tools: Dictionary of available tools (for execution)
+
+        Returns:
+            Tuple of (text content, tool calls in OpenAI message format,
+            tasks executing the tool calls in request order)
+        """
+        content_parts: List[str] = []
+        tool_calls: List[Dict[str, Any]] = []
+        # Streamed argument fragments per call, joined once the call is complete
+        argument_parts: List[List[str]] = []
+        tool_tasks: List[asyncio.Task] = []
+
+        def dispatch_until(index: int) -> None:
+            while len(tool_tasks) < index:
+                tool_call = tool_calls[len(tool_tasks)]
+                tool_call["function"]["arguments"] = "".join(
+                    argument_parts[len(tool_tasks)]
+                )
+                tool_tasks.append(
+                    asyncio.create_task(
+                        self.mcp_base.execute_tool_call(
+                            tool_call, tools, self._tool_names
+                        )
+                    )
+                )
+
+        try:
+            stream = await self.client.chat.completions.create(
+                model=self.model_name,
+                messages=messages,
+                tools=available_tools,
+                stream=True,
+                **self._prompt_cache_kwargs,
+            )
+            async with stream:
+                async for chunk in stream:
+                    if not chunk.choices or not chunk.choices[0].delta:
+                        continue
+                    delta = chunk.choices[0].delta
+
+                    if delta.content:
+                        content_parts.append(delta.content)
+
+                    for tool_delta in delta.tool_calls or []:
+                        if tool_delta.index >= len(tool_calls):
+                            # A new call starts: every earlier call is complete
+                            dispatch_until(len(tool_calls))
+                            tool_calls.append(
+                                {
+                                    "id": tool_delta.id,
+                                    "type": "function",
+                                    "function": {"name": "", "arguments": ""},
+                                }
+                            )
+                            argument_parts.append([])
+
+                        tool_call = tool_calls[tool_delta.index]
+                        if tool_delta.id:
+                            tool_call["id"] = tool_delta.id
+                        if tool_delta.function and tool_delta.function.name:
+                            tool_call["function"]["name"] = tool_delta.function.name
+                        if tool_delta.function and tool_delta.function.arguments:
+                            argument_parts[tool_delta.index].append(
+                                tool_delta.function.arguments
+                            )
+
+            dispatch_until(len(tool_calls))
+
+        except BaseException:
+            for task in tool_tasks:
+                task.cancel()
+            raise
+
+        return "".join(content_parts), tool_calls, tool_tasks
+
+    async def _prepare_tools(
+        self,
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Open the MCP connections for a query and discover the tools.
+
+        Connections stay open across rounds and queries until ``close()``.
+        If the previous discovery came back empty or some servers failed to
+        connect, or the tool cache was invalidated, the pinned connections
+        are released first so every server is connected again.
+
+        Returns:
+            Tuple of (tools keyed by full name, OpenAI-format tool list)
+        """
+        if self._reconnect_mcp:
+            self._reconnect_mcp = False
+            self._tools_cache = None
+            await self.mcp_base.aclose()
+        await self.mcp_base.open()
+
+        return await self._discover_tools()
+
+    async def _discover_tools(
+        self,
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Discover MCP tools and format them for the LLM, reusing recent results.
+
+        Discovery connects to every configured MCP server, so results are kept
+        for ``tools_ttl`` seconds. Empty or partial results are never cached,
+        and schedule a reconnect before the next query.
+
+        Returns:
+            Tuple of (tools keyed by full name, OpenAI-format tool list)
+        """
+        now = time.monotonic()
+        if self._tools_cache and now - self._tools_cache[0] < self.tools_ttl:
+            _, tools, available_tools = self._tools_cache
+            return tools, available_tools
+
+        # Discover available tools using MCPBase component
+        tools = await self.mcp_base.list_tools()
+        self.logger.info(f"Available tools nums: {len(tools)}")
+        self.logger.opt(lazy=True).info("Available tools: {}", lambda: list(tools))
+
+        # Format tools for LLM (OpenAI Format), once per discovery; every
+        # round of every query within tools_ttl reuses this exact list
+        available_tools = format_tools_for_openai(tools)
+
+        self.tools_store = tools
+        self.available_tools = available_tools
+        self._tool_names = build_tool_name_index(tools)
+        self._prompt_cache_kwargs = prompt_cache_kwargs(
+            self.client.base_url, self.system_prompt, *tools
+        )
+        failed_servers = self.mcp_base.server_manager.failed_servers
+        if tools and not failed_servers:
+            self._tools_cache = (now, tools, available_tools)
+        else:
+            self.logger.warning(
+                "MCP tool discovery incomplete (failed servers: {}), "
+                "reconnecting before the next query",
+                failed_servers or "all",
+            )
+            self._reconnect_mcp = True
+
+        return tools, available_tools
+
+    def invalidate_tools_cache(self) -> None:
+        """Force the next query to reconnect to the MCP servers and rediscover tools."""
+        self._tools_cache = None
+        self._reconnect_mcp = True
+
     async def _generate_final_response(self) -> str:
         """
         Generate final response after max iterations reached.
 
-        Args:
-            available_tools: List of available tools (empty to force final response)
+        The request carries no tools, so the LLM has to answer from the tool
+        results already in memory.
 
         Returns:
             Final text response from LLM
@@ -287,8 +556,8 @@ class MCPBaseAgent(BaseAgent):
         )
 
         messages = self.memory.get_view("chat_messages")
-        completion = self.client.chat.completions.create(
-            model=self.model_name, messages=messages
+        completion = await self.client.chat.completions.create(
+            model=self.model_name, messages=messages, **self._prompt_cache_kwargs
         )
         final_content = completion.choices[0].message.content
         self.memory.add({"role": "assistant", "content": final_content})
@@ -334,9 +603,18 @@ class MCPBaseAgent(BaseAgent):
         """
         self.memory.append_history(history_episodes)
 
+    def close(self) -> None:
+        """Close the MCP server connections held open between queries."""
+        if _BACKGROUND_LOOP is None:
+            return
+        asyncio.run_coroutine_threadsafe(
+            self.mcp_base.aclose(), _BACKGROUND_LOOP
+        ).result()
+
     def clear_history(self) -> None:
-        """Clear conversation memory, keeping system prompt."""
+        """Clear conversation memory and memoized tool results, keeping system prompt."""
         self.memory.clear_history()
+        self.mcp_base.clear_memo_cache()
 
     def __repr__(self) -> str:
         """String representation of the agent."""
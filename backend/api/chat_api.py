@@ -3,25 +3,24 @@ IntelliSearch 聊天API服务 - 支持真正的流式输出
 基于LLMClient实现真实的流式响应
 """
 import os
-import sys
-import json
+import asyncio
 import logging
+import time
 import uuid
+from contextlib import suppress
 from datetime import datetime
-from typing import Dict, Any, Optional, AsyncGenerator
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, AsyncGenerator
 
+import orjson
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from sse_starlette.sse import EventSourceResponse
 
-# 添加项目根目录到路径
-sys.path.append(os.getcwd())
 from config.config_loader import Config
-
-# Load environment variables from config.yaml
-config = Config.get_instance()
-
-from backend.core.llm_client import LLMClient
+from backend.core.llm_client import LLMClient, invalidate_tool_manifests
+from backend.core.mcp_client import close_shared_mcp_clients
+from backend.core.session_pool import SessionPool
 from core.logger import get_logger
 
 # 配置日志
@@ -40,11 +39,56 @@ class ChatRequest(BaseModel):
     max_tool_calls: Optional[int] = 5
     system_prompt: Optional[str] = None
 
-# 存储会话
-sessions: Dict[str, LLMClient] = {}
+# content增量合并阈值：累计字符数或距上次输出的时间（秒）
+CONTENT_FLUSH_CHARS = 64
+CONTENT_FLUSH_INTERVAL = 0.02
+
+# SSE保活ping间隔（秒），防止长时间工具调用期间代理断开连接
+SSE_PING_INTERVAL = 15
+
+# SSE帧前缀与结尾（orjson已追加一个换行，这里补齐空行）
+_SSE_PREFIX = b"data: "
+_SSE_SUFFIX = b"\n"
+
+# SSE流结束标记（预先编码的常量帧）
+_DONE = b"data: [DONE]\n\n"
 
-# 加载默认系统提示词
-def load_system_prompt():
+# 出现这些事件的响应不写入响应缓存（调用过工具的回答依赖实时结果，不能重放）
+UNCACHEABLE_FRAME_PREFIXES = (
+    b'data: {"type":"error"',
+    b'data: {"type":"warning"',
+    b'data: {"type":"tool_call_start"',
+)
+
+# 会话池上限与空闲过期时间（秒）
+SESSION_POOL_MAXSIZE = 512
+SESSION_TTL_SECONDS = 1800
+
+# 存储会话（LRU + TTL，淘汰时自动清理MCP连接）
+sessions = SessionPool(maxsize=SESSION_POOL_MAXSIZE, ttl=SESSION_TTL_SECONDS)
+
+@lru_cache(maxsize=1)
+def _get_config() -> Config:
+    """获取全局配置，首次调用时加载config.yaml并注入环境变量，同时应用会话池配置"""
+    try:
+        config = Config.get_instance()
+    except RuntimeError:
+        config = Config(config_file_path="config/config.yaml")
+        config.load_config(override=True)
+
+    # YAML中留空的配置项为None，回退到默认值
+    sessions.maxsize = int(
+        config.get("backend.sessions.max_sessions") or SESSION_POOL_MAXSIZE
+    )
+    sessions.ttl = float(
+        config.get("backend.sessions.ttl_seconds") or SESSION_TTL_SECONDS
+    )
+    return config
+
+
+# 加载默认系统提示词（进程内只读取一次）
+@lru_cache(maxsize=1)
+def load_system_prompt() -> str:
     """加载系统提示词"""
     try:
         with open("prompts/base_system_prompt.md", "r", encoding="utf-8") as file:
@@ -68,6 +112,7 @@ def get_or_create_session(session_id: Optional[str] = None, **kwargs) -> str:
 
     try:
         # 获取base_url和api_key配置
+        _get_config()
         base_url = os.environ.get("BASE_URL", "https://api.deepseek.com")
         api_key_env = "OPENAI_API_KEY"
 
@@ -81,29 +126,84 @@ def get_or_create_session(session_id: Optional[str] = None, **kwargs) -> str:
         chat_client.system_prompt = system_prompt
         chat_client.max_tool_calls = max_tool_calls
 
-        sessions[new_session_id] = chat_client
-        logger.info(f"Created new session: {new_session_id}")
+        sessions.add(new_session_id, chat_client, info={
+            "session_id": new_session_id,
+            "model_name": model_name,
+            "max_tool_calls": max_tool_calls
+        })
+        logger.info("Created new session: {}", new_session_id)
     except Exception as e:
-        logger.error(f"Failed to create session {new_session_id}: {e}")
+        logger.error("Failed to create session {}: {}", new_session_id, e)
         raise HTTPException(status_code=500, detail=f"Failed to create session: {str(e)}")
 
     return new_session_id
 
 
-def format_sse_event(event_type: str, data: Dict[str, Any]) -> str:
-    """格式化SSE事件"""
+# 事件时间戳缓存: (整数秒, ISO格式字符串)，同一秒内的事件复用格式化结果
+_timestamp_cache = (0, "")
+
+
+def _event_timestamp() -> str:
+    """获取事件时间戳（秒级精度），每秒只格式化一次"""
+    global _timestamp_cache
+    now = int(time.time())
+    if now != _timestamp_cache[0]:
+        _timestamp_cache = (now, datetime.fromtimestamp(now).isoformat())
+    return _timestamp_cache[1]
+
+
+def format_sse_event(event_type: str, data: Dict[str, Any]) -> bytes:
+    """格式化SSE事件，直接输出UTF-8字节，省去响应层的二次编码"""
     event_data = {
         "type": event_type,
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": _event_timestamp(),
         **data
     }
-    return f"data: {json.dumps(event_data, ensure_ascii=False)}\n\n"
+    return _SSE_PREFIX + orjson.dumps(event_data, option=orjson.OPT_APPEND_NEWLINE) + _SSE_SUFFIX
+
 
+async def stream_chat_process(chat_client: LLMClient, user_message: str) -> AsyncGenerator[bytes, None]:
+    """
+    带响应缓存的流式聊天处理
 
-async def stream_chat_process(chat_client: LLMClient, user_message: str) -> AsyncGenerator[str, None]:
+    同一会话中完全相同的请求（系统提示词 + 用户消息）在有效期内直接重放缓存的SSE帧，
+    只有未出现错误、警告或工具调用的完整响应才会写入缓存。同一会话的请求持有会话锁串行处理，
+    并发重复提交的请求会等待前一个完成后命中缓存，而不是重复调用LLM和工具。
+    """
+    cache_key = chat_client.response_cache_key(user_message)
+    async with chat_client.request_lock:
+        cached_frames = chat_client.get_cached_response(cache_key)
+        if cached_frames is not None:
+            logger.info("Response cache hit, replaying cached frames")
+            for frame in cached_frames:
+                yield frame
+            return
+
+        frames: List[bytes] = []
+        cacheable = True
+        async for frame in _stream_chat_events(chat_client, user_message):
+            if frame.startswith(UNCACHEABLE_FRAME_PREFIXES):
+                cacheable = False
+            frames.append(frame)
+            yield frame
+
+        if cacheable:
+            chat_client.cache_response(cache_key, frames)
+
+
+async def _stream_chat_events(chat_client: LLMClient, user_message: str) -> AsyncGenerator[bytes, None]:
     """
     真正的流式聊天处理 - 基于LLMClient的流式实现
+
+    连续的content增量会合并为一个SSE帧输出，满足CONTENT_FLUSH_CHARS或
+    CONTENT_FLUSH_INTERVAL任一条件即刷新，其他事件到来前先刷新缓冲保证顺序。
+    缓冲非空时等待下一个事件最多到刷新时间点，上游停顿时也会按时输出已缓冲的内容。
     """
+    content_buffer: List[str] = []
+    buffered_chars = 0
+    last_flush = time.monotonic()
+    next_event: Optional[asyncio.Future] = None
+
     try:
         # 发送开始事件
         yield format_sse_event("start", {"message": "开始处理您的请求..."})
@@ -111,20 +211,20 @@ async def stream_chat_process(chat_client: LLMClient, user_message: str) -> Asyn
         # 列出可用工具
         yield format_sse_event("tools_discovery", {"message": "🔌 正在连接和发现工具..."})
 
-        tools = await chat_client.mcp_client.list_tools()
+        tools, _ = await chat_client.get_tools()
         if not tools:
             yield format_sse_event("warning", {"message": "未发现可用工具"})
 
-        chat_client.logger.info(f"Available Tools: {tools}")
+        chat_client.logger.debug("Available Tools: {}", tools)
 
         yield format_sse_event("tools_ready", {
             "message": f"✅ 发现 {len(tools)} 个可用工具",
             "tools_count": len(tools)
         })
 
-        # 准备消息历史，包含系统提示词和用户消息
+        # 准备消息历史，复用会话预先构建的系统消息
         messages = [
-            {"role": "system", "content": chat_client.system_prompt},
+            chat_client.system_message,
             {"role": "user", "content": user_message}
         ]
 
@@ -132,16 +232,49 @@ async def stream_chat_process(chat_client: LLMClient, user_message: str) -> Asyn
         tool_call_count = 0
         max_tool_calls = getattr(chat_client, 'max_tool_calls', 20)
 
-        async for event in chat_client.chat_completion_stream(messages, tools, max_tool_calls):
+        # tools=None 让LLMClient复用已缓存的OpenAI格式工具列表
+        events = chat_client.chat_completion_stream(messages, None, max_tool_calls).__aiter__()
+        while True:
+            # 在独立任务中等待下一个事件，刷新超时不会取消上游生成器
+            if next_event is None:
+                next_event = asyncio.ensure_future(events.__anext__())
+            if content_buffer:
+                timeout = last_flush + CONTENT_FLUSH_INTERVAL - time.monotonic()
+                done, _ = await asyncio.wait((next_event,), timeout=max(timeout, 0))
+                if not done:
+                    yield format_sse_event("content", {"content": "".join(content_buffer)})
+                    content_buffer.clear()
+                    buffered_chars = 0
+                    last_flush = time.monotonic()
+                    continue
+            try:
+                event = await next_event
+            except StopAsyncIteration:
+                break
+            finally:
+                next_event = None
             event_type = event["type"]
 
             if event_type == "content":
-                # 真正的流式内容输出
-                yield format_sse_event("content", {
-                    "content": event["content"]
-                })
-
-            elif event_type == "tool_call_start":
+                # 合并流式内容输出
+                content_buffer.append(event["content"])
+                buffered_chars += len(event["content"])
+                now = time.monotonic()
+                if buffered_chars >= CONTENT_FLUSH_CHARS or now - last_flush >= CONTENT_FLUSH_INTERVAL:
+                    yield format_sse_event("content", {"content": "".join(content_buffer)})
+                    content_buffer.clear()
+                    buffered_chars = 0
+                    last_flush = now
+                continue
+
+            # 输出其他事件前先刷新已缓冲的内容
+            if content_buffer:
+                yield format_sse_event("content", {"content": "".join(content_buffer)})
+                content_buffer.clear()
+                buffered_chars = 0
+                last_flush = time.monotonic()
+
+            if event_type == "tool_call_start":
                 tool_call_count += 1
                 tool_call = event["tool_call"]
                 yield format_sse_event("tool_call_start", {
@@ -158,49 +291,43 @@ async def stream_chat_process(chat_client: LLMClient, user_message: str) -> Asyn
                 })
 
             elif event_type == "tool_result":
+                # LLMClient已生成截断预览与长度信息，直接转发
                 tool_result = event["tool_result"]
-                # 处理工具结果截断
-                result_content = tool_result["result"]
-                if len(result_content) > 500:
-                    truncated_result = result_content[:500] + "...(已截断)"
-                    yield format_sse_event("tool_result", {
-                        "message": "✅ 工具执行结果 (已截断):",
-                        "tool_name": tool_result["name"],
-                        "result": truncated_result,
-                        "full_length": len(result_content),
-                        "truncated": True
-                    })
-                else:
-                    yield format_sse_event("tool_result", {
-                        "message": "✅ 工具执行结果:",
-                        "tool_name": tool_result["name"],
-                        "result": result_content,
-                        "full_length": len(result_content),
-                        "truncated": False
-                    })
+                yield format_sse_event("tool_result", {
+                    "message": "✅ 工具执行结果 (已截断):" if tool_result["truncated"] else "✅ 工具执行结果:",
+                    "tool_name": tool_result["name"],
+                    "result": tool_result["result"],
+                    "full_length": tool_result["full_length"],
+                    "truncated": tool_result["truncated"]
+                })
 
             elif event_type == "error":
                 yield format_sse_event("error", {
                     "message": f"❌ 处理错误: {event['error']}"
                 })
 
+        if content_buffer:
+            yield format_sse_event("content", {"content": "".join(content_buffer)})
+            content_buffer.clear()
+
         yield format_sse_event("session_complete", {
             "message": "🎉 对话完成"
         })
 
     except Exception as e:
-        logger.error(f"Error in stream_chat_process: {e}", exc_info=True)
+        logger.opt(exception=True).error("Error in stream_chat_process: {}", e)
+        if content_buffer:
+            yield format_sse_event("content", {"content": "".join(content_buffer)})
         yield format_sse_event("error", {
             "message": f"❌ 处理过程中发生错误: {str(e)}",
             "error": str(e)
         })
-
     finally:
-        # 确保清理MCP连接
-        try:
-            await chat_client.mcp_client.server_manager.close_all_connections()
-        except Exception as e:
-            logger.error(f"Error closing MCP connections: {e}")
+        # 客户端断开时取消仍在等待的上游事件
+        if next_event is not None:
+            next_event.cancel()
+            with suppress(asyncio.CancelledError, StopAsyncIteration):
+                await next_event
 
 
 @router.post("")
@@ -208,6 +335,13 @@ async def stream_chat_process(chat_client: LLMClient, user_message: str) -> Asyn
 async def chat(request: ChatRequest):
     """非流式聊天接口"""
 
+    # 不使用工具时直接返回固定回复，无需创建会话
+    if not request.use_tools:
+        return {
+            "content": "你好！我是IntelliSearch智能助手。我可以帮助您进行各种搜索和信息查询。如需使用搜索功能，请在请求中设置 use_tools=true。",
+            "session_id": request.session_id or ""
+        }
+
     try:
         # 获取或创建会话
         session_id = get_or_create_session(
@@ -218,16 +352,12 @@ async def chat(request: ChatRequest):
         )
 
         # 简单的对话响应（不流式）
-        response = ""
-        if not request.use_tools:
-            response = "你好！我是IntelliSearch智能助手。我可以帮助您进行各种搜索和信息查询。如需使用搜索功能，请在请求中设置 use_tools=true。"
-        else:
-            response = "您好！我是IntelliSearch智能助手，配备了强大的搜索工具。请告诉我您想搜索什么信息？"
+        response = "您好！我是IntelliSearch智能助手，配备了强大的搜索工具。请告诉我您想搜索什么信息？"
 
         return {"content": response, "session_id": session_id}
 
     except Exception as e:
-        logger.error(f"Error in chat: {e}")
+        logger.error("Error in chat: {}", e)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
@@ -254,66 +384,59 @@ async def chat_stream(request: ChatRequest):
 
                 # 发送结束标记
                 yield format_sse_event("done", {"message": "会话结束"})
-                yield "data: [DONE]\n\n"
+                yield _DONE
 
             except Exception as e:
-                logger.error(f"Error in generate: {e}")
+                logger.error("Error in generate: {}", e)
                 yield format_sse_event("error", {"message": f"生成响应时发生错误: {str(e)}"})
-                yield "data: [DONE]\n\n"
+                yield _DONE
 
-        return StreamingResponse(
+        # 帧已预先编码为bytes，EventSourceResponse原样写出；
+        # 同时负责Cache-Control/X-Accel-Buffering等头部和保活ping
+        return EventSourceResponse(
             generate(),
-            media_type="text/event-stream",
+            ping=SSE_PING_INTERVAL,
             headers={
-                "Cache-Control": "no-cache",
-                "Connection": "keep-alive",
-                "X-Accel-Buffering": "no",
                 "Access-Control-Allow-Origin": "*",
                 "Access-Control-Allow-Headers": "*",
             }
         )
 
     except Exception as e:
-        logger.error(f"Error in chat_stream: {e}")
+        logger.error("Error in chat_stream: {}", e)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
 @router.delete("/sessions/{session_id}")
 async def delete_session(session_id: str):
     """删除会话"""
-    if session_id not in sessions:
+    # MCP连接由所有会话共享，删除会话无需清理连接
+    if sessions.pop(session_id) is None:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    try:
-        # 清理MCP连接
-        await sessions[session_id].mcp_client.server_manager.close_all_connections()
-        del sessions[session_id]
-        return {"message": "Session deleted successfully"}
-    except Exception as e:
-        logger.error(f"Error deleting session {session_id}: {e}")
-        del sessions[session_id]  # 即使出错也要删除会话
-        return {"message": "Session deleted (with cleanup errors)"}
+    return {"message": "Session deleted successfully"}
+
+
+async def close_all_sessions():
+    """清空会话并关闭共享的MCP连接（应用关闭时调用）"""
+    sessions.clear()
+    await close_shared_mcp_clients()
 
 
 @router.get("/sessions")
 async def list_sessions():
-    """列出所有活跃会话"""
-    session_info = []
-    for session_id, chat_client in sessions.items():
-        session_info.append({
-            "session_id": session_id,
-            "model_name": chat_client.model_name,
-            "max_tool_calls": getattr(chat_client, 'max_tool_calls', 5)
-        })
+    """列出所有活跃会话（只读取创建时记录的会话信息）"""
+    session_info = list(sessions.infos())
 
     return {"sessions": session_info, "total": len(session_info)}
 
 
 @router.get("/tools")
 async def list_available_tools():
-    """列出可用工具（使用临时会话）"""
+    """列出可用工具（使用临时会话，优先读取共享的工具清单缓存）"""
     try:
         # 创建临时会话来获取工具列表
+        _get_config()
         base_url = os.environ.get("BASE_URL", "https://api.deepseek.com")
         api_key_env = "OPENAI_API_KEY"
 
@@ -322,10 +445,32 @@ async def list_available_tools():
             base_url=base_url,
             api_key_env=api_key_env
         )
-        tools = await temp_client.mcp_client.list_tools()
-        await temp_client.mcp_client.server_manager.close_all_connections()
+        tools, _ = await temp_client.get_tools()
 
         return {"tools": tools, "total": len(tools)}
     except Exception as e:
-        logger.error(f"Error listing tools: {e}")
-        raise HTTPException(status_code=500, detail=f"Error listing tools: {str(e)}")
\ No newline at end of file
+        logger.error("Error listing tools: {}", e)
+        raise HTTPException(status_code=500, detail=f"Error listing tools: {str(e)}")
+
+
+async def prefetch_tools() -> None:
+    """后台预热工具清单，使首个聊天请求无需等待工具发现"""
+    try:
+        _get_config()
+        temp_client = LLMClient(
+            model_name="deepseek-chat",
+            base_url=os.environ.get("BASE_URL", "https://api.deepseek.com"),
+            api_key_env="OPENAI_API_KEY"
+        )
+        tools, _ = await temp_client.get_tools()
+        logger.info("Prefetched {} tools", len(tools))
+    except Exception as e:
+        logger.warning("Tool prefetch failed: {}", e)
+
+
+@router.post("/tools/refresh")
+async def refresh_tools():
+    """清除工具清单缓存，重新连接MCP服务器并发现工具（MCP服务器变更后调用）"""
+    invalidate_tool_manifests()
+    await close_shared_mcp_clients()
+    return await list_available_tools()
\ No newline at end of file
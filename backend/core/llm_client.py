@@ -2,15 +2,53 @@
 LLM客户端核心模块,负责处理与语言模型的交互
 """
 import os
-import json
+import time
 import asyncio
-from config.config_loader import Config
-from typing import List, Dict, Any, Optional, AsyncGenerator
-from openai import OpenAI
+import hashlib
+from collections import OrderedDict
 
-from .mcp_client import MCPClient
+import orjson
+from config.config_loader import Config
+from typing import List, Dict, Any, Optional, AsyncGenerator, Tuple
+from openai import AsyncOpenAI
+
+from .mcp_client import (
+    MCPClient,
+    close_shared_mcp_clients,
+    get_shared_mcp_client,
+    invalidate_server_configs,
+)
+from tools.server_manager import (
+    build_tool_name_index,
+    format_tools_for_openai,
+    tool_result_text,
+    truncate_tool_result,
+)
 from core.tool_hash import fix_tool_args
 from core.logger import get_logger
+from core.openai_client import get_async_client, prompt_cache_kwargs
+
+# 工具结果在流式事件中的预览长度
+TOOL_RESULT_PREVIEW_CHARS = 500
+
+# 写入消息历史（发送给LLM）的工具结果最大长度，超出部分保留首尾并截断中间
+TOOL_RESULT_HISTORY_CHARS = 8000
+
+# 完全相同请求的响应缓存条数与有效期（秒）
+RESPONSE_CACHE_SIZE = 128
+RESPONSE_CACHE_TTL = 300.0
+
+# 进程内共享的工具清单: MCP配置路径 -> (发现时间, 工具字典, OpenAI格式工具列表, 短名称->完整名称)
+_TOOL_MANIFESTS: Dict[str, Tuple[float, Dict[str, Any], List[Dict[str, Any]], Dict[str, str]]] = {}
+
+# 正在进行的工具发现任务: MCP配置路径 -> Task，并发请求等待同一次发现
+_TOOL_DISCOVERY_TASKS: Dict[str, "asyncio.Task[Tuple[Dict[str, Any], bool]]"] = {}
+
+
+def invalidate_tool_manifests() -> None:
+    """清除所有会话共享的工具清单缓存和MCP配置缓存，下次请求时重新发现工具"""
+    _TOOL_MANIFESTS.clear()
+    invalidate_server_configs()
 
 
 class LLMClient:
@@ -20,93 +58,251 @@ class LLMClient:
         self,
         model_name: str = "default_model",
         base_url: str = "EMPTY",
-        api_key_env: str = "OPENAI_API_KEY"
+        api_key_env: str = "OPENAI_API_KEY",
+        tools_ttl: float = 60.0
     ):
         self.model_name = model_name
         self.base_url = base_url
         self.logger = get_logger(__name__)
 
-        api_key = os.environ.get(api_key_env)
-        if not api_key:
+        # 工具清单缓存有效期（秒），同一MCP配置的所有会话共享发现结果
+        self.tools_ttl = tools_ttl
+
+        # 会话请求锁：同一会话的请求串行处理，重复提交的请求可直接命中响应缓存
+        self.request_lock = asyncio.Lock()
+
+        # 响应缓存: hash(系统提示词 + 用户消息) -> (写入时间, 已编码的SSE帧)
+        self._response_cache: "OrderedDict[bytes, Tuple[float, List[bytes]]]" = OrderedDict()
+
+        self._api_key = os.environ.get(api_key_env)
+        if not self._api_key:
             raise ValueError(
                 f"Environment variable '{api_key_env}' not found. Please set it."
             )
 
-        self.client = OpenAI(api_key=api_key, base_url=self.base_url)
-        self.mcp_client = MCPClient()
+        self.system_prompt = self.get_system_prompt()
+
+    @property
+    def mcp_client(self) -> MCPClient:
+        """进程内共享的MCP客户端，服务器连接在各会话、各轮之间保持打开"""
+        return get_shared_mcp_client()
+
+    @property
+    def system_prompt(self) -> str:
+        """系统提示词"""
+        return self._system_prompt
+
+    @system_prompt.setter
+    def system_prompt(self, prompt: str) -> None:
+        """设置系统提示词，同时预先构建系统消息和响应缓存键的哈希前缀"""
+        self._system_prompt = prompt
+        self.system_message = {"role": "system", "content": prompt}
+        self._prompt_hasher = hashlib.blake2b(prompt.encode("utf-8"), digest_size=16)
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        """共享的AsyncOpenAI客户端，同一端点的会话复用连接池"""
+        return get_async_client(self.base_url, self._api_key)
 
     def format_tools_for_openai(self, tools: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """将工具列表格式化为OpenAI API格式"""
-        return [
-            {
-                "type": "function",
-                "function": {
-                    "name": f"{tool.get('name')}",
-                    "description": tool.get("description"),
-                    "input_schema": tool.get("input_schema"),
-                },
-            }
-            for tool in list(tools.values())
-        ]
+        """将工具列表格式化为OpenAI API格式（输入schema作为parameters字段）"""
+        return format_tools_for_openai(tools)
+
+    async def get_tools(self) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """获取可用工具及其OpenAI格式，在tools_ttl秒内复用共享的工具清单"""
+        tools, available_tools, _ = await self._get_tool_manifest()
+        return tools, available_tools
+
+    async def _get_tool_manifest(self) -> Tuple[Dict[str, Any], List[Dict[str, Any]], Dict[str, str]]:
+        """获取工具清单：工具字典、OpenAI格式工具列表、短名称到完整名称的索引"""
+        config_path = self.mcp_client.config_path
+        manifest = _TOOL_MANIFESTS.get(config_path)
+        if manifest and time.monotonic() - manifest[0] < self.tools_ttl:
+            return manifest[1:]
+
+        # 已有发现任务在进行（如启动预热）时直接等待其结果，不重复连接MCP服务器
+        task = _TOOL_DISCOVERY_TASKS.get(config_path)
+        if task is None:
+            task = asyncio.create_task(self._discover_tools())
+            _TOOL_DISCOVERY_TASKS[config_path] = task
+            task.add_done_callback(lambda _: _TOOL_DISCOVERY_TASKS.pop(config_path, None))
+
+        # shield: 单个请求被取消时不影响其他等待者
+        tools, complete = await asyncio.shield(task)
+        manifest = _TOOL_MANIFESTS.get(config_path)
+        if manifest and manifest[1] is tools:
+            return manifest[1:]
+
+        available_tools = self.format_tools_for_openai(tools)
+        tool_names = build_tool_name_index(tools)
+        # 发现失败或部分服务器连接失败时不缓存，下次请求重新发现
+        if tools and complete:
+            _TOOL_MANIFESTS[config_path] = (time.monotonic(), tools, available_tools, tool_names)
+        return tools, available_tools, tool_names
+
+    async def _discover_tools(self) -> Tuple[Dict[str, Any], bool]:
+        """打开共享MCP连接并发现工具，返回(工具字典, 是否所有服务器都连接成功)
+
+        发现结果为空或有服务器连接失败时，丢弃共享客户端，避免失败的连接
+        在整个进程内长期保持；下次请求会创建新客户端并重新连接
+        """
+        mcp_client = self.mcp_client
+        try:
+            await mcp_client.open()
+        except Exception as e:
+            self.logger.error("Failed to open MCP connections: {}", e)
+        tools = await mcp_client.list_tools()
+
+        failed_servers = mcp_client.server_manager.failed_servers
+        complete = bool(tools) and not failed_servers
+        if not complete:
+            self.logger.warning(
+                "MCP tool discovery incomplete (failed servers: {}), dropping shared client",
+                failed_servers or "all",
+            )
+            await close_shared_mcp_clients()
+        return tools, complete
+
+    def invalidate_tools_cache(self) -> None:
+        """清除当前MCP配置的工具清单缓存"""
+        _TOOL_MANIFESTS.pop(self.mcp_client.config_path, None)
+
+    def response_cache_key(self, message: str) -> bytes:
+        """计算响应缓存键（系统提示词 + 用户消息）"""
+        hasher = self._prompt_hasher.copy()
+        hasher.update(message.encode("utf-8"))
+        return hasher.digest()
+
+    def get_cached_response(self, key: bytes) -> Optional[List[bytes]]:
+        """获取缓存的SSE帧，命中时刷新其LRU位置，超过RESPONSE_CACHE_TTL的条目视为未命中并删除"""
+        entry = self._response_cache.get(key)
+        if entry is None:
+            return None
+        cached_at, frames = entry
+        if time.monotonic() - cached_at >= RESPONSE_CACHE_TTL:
+            del self._response_cache[key]
+            return None
+        self._response_cache.move_to_end(key)
+        return frames
+
+    def cache_response(self, key: bytes, frames: List[bytes]) -> None:
+        """缓存一次完整响应的SSE帧，超出容量时淘汰最久未使用的条目"""
+        self._response_cache[key] = (time.monotonic(), frames)
+        self._response_cache.move_to_end(key)
+        while len(self._response_cache) > RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
 
     async def chat_completion_stream(
         self,
         messages: List[Dict[str, Any]],
         tools: Optional[Dict[str, Any]] = None,
-        max_tool_calls: int = 20
+        max_tool_calls: int = 20,
+        emit_tool_events: bool = True
     ) -> AsyncGenerator[Dict[str, Any], None]:
         """
         流式聊天完成，支持工具调用
 
+        Args:
+            messages: 发送给模型的消息列表，每轮的助手消息和工具结果直接追加到该列表，
+                不会重建整个消息历史
+            tools: 工具字典，为None时使用缓存的工具发现结果
+            max_tool_calls: 最大工具调用轮数
+            emit_tool_events: 是否产出工具调用相关事件，只需要文本的调用方可关闭，
+                避免构造并传递不会被使用的事件
+
         Yields:
             Dict: 包含类型和数据的字典
                 - type: "content", "tool_call_start", "tool_call_delta", "tool_result", "error"
         """
         try:
-            # 获取可用工具
+            # 获取可用工具（未指定时使用缓存的工具发现结果）
             if tools is None:
-                tools = await self.mcp_client.list_tools()
-
-            available_tools = self.format_tools_for_openai(tools)
-            self.logger.info(f"Available Tools: {len(tools)} tools loaded")
-
-            # 处理工具调用循环
-            for round_count in range(max_tool_calls):
-                self.logger.info(f"Processing round {round_count + 1}")
-
-                # 创建流式响应
-                with self.client.chat.completions.create(
-                    model=self.model_name,
-                    messages=messages,
-                    tools=available_tools if available_tools else None,
-                    stream=True,
-                ) as stream:
-                    tool_calls = []
-                    current_tool_call = None
-
-                    # 处理流式响应
-                    for chunk in stream:
-                        if chunk.choices and chunk.choices[0].delta:
+                tools, available_tools, tool_names = await self._get_tool_manifest()
+            else:
+                available_tools = self.format_tools_for_openai(tools)
+                tool_names = build_tool_name_index(tools)
+            self.logger.info("Available Tools: {} tools loaded", len(tools))
+
+            # 系统提示词 + 工具列表在各轮之间保持不变，提示服务端复用前缀缓存
+            cache_hint = prompt_cache_kwargs(self.client.base_url, self.system_prompt, *tools)
+
+            request_kwargs: Dict[str, Any] = {
+                "model": self.model_name,
+                "stream": True,
+                **cache_hint,
+            }
+            if available_tools:
+                request_kwargs["tools"] = available_tools
+
+            # 处理工具调用循环，超过轮数限制后追加一轮不带工具的最终响应
+            for round_count in range(max_tool_calls + 1):
+                final_round = round_count == max_tool_calls
+                if final_round:
+                    self.logger.error("Tool calling limit exceeded: {}", max_tool_calls)
+                    messages.append({
+                        "role": "user",
+                        "content": "Error: Maximum tool calling limit reached. Please use the information obtained to provide the final answer."
+                    })
+                    request_kwargs.pop("tools", None)
+                else:
+                    self.logger.info("Processing round {}", round_count + 1)
+
+                tool_calls = []
+                current_tool_call = None
+                content_parts: List[str] = []
+                # 每个工具调用的参数片段，参数完整后一次性拼接
+                argument_parts: List[List[str]] = []
+                # 按调用顺序排列的工具执行任务，参数完整即启动，与后续生成重叠
+                tool_tasks: List[asyncio.Task] = []
+
+                async def run_tool_call(index: int, tool_call: Dict[str, Any]) -> Tuple[int, str]:
+                    return index, await self._execute_tool_call(tool_call, tools, tool_names)
+
+                async def dispatch_until(count: int) -> None:
+                    """启动前count个尚未执行的工具调用，首次启动时确保共享的MCP连接已打开"""
+                    if final_round or len(tool_tasks) >= count:
+                        return
+                    if not tool_tasks:
+                        await self.mcp_client.open()
+                    while len(tool_tasks) < count:
+                        index = len(tool_tasks)
+                        tool_call = tool_calls[index]
+                        tool_call["function"]["arguments"] = "".join(argument_parts[index])
+                        tool_tasks.append(asyncio.create_task(run_tool_call(index, tool_call)))
+
+                try:
+                    # 创建流式响应
+                    async with await self.client.chat.completions.create(
+                        messages=messages,
+                        **request_kwargs,
+                    ) as stream:
+                        # 处理流式响应
+                        async for chunk in stream:
+                            if not chunk.choices or not chunk.choices[0].delta:
+                                continue
                             delta = chunk.choices[0].delta
 
                             # 处理内容
                             if getattr(delta, "content", None):
+                                content_parts.append(delta.content)
                                 yield {"type": "content", "content": delta.content}
 
                             # 处理工具调用
-                            if getattr(delta, "tool_calls", None):
-                                for tool_delta in delta.tool_calls:
-                                    if tool_delta.index >= len(tool_calls):
-                                        # 新工具调用
-                                        tool_calls.append({
-                                            "id": tool_delta.id,
-                                            "type": "function",
-                                            "function": {
-                                                "name": tool_delta.function.name if tool_delta.function.name else "",
-                                                "arguments": tool_delta.function.arguments if tool_delta.function.arguments else "",
-                                            },
-                                        })
-                                        current_tool_call = tool_calls[-1]
+                            for tool_delta in getattr(delta, "tool_calls", None) or []:
+                                if tool_delta.index >= len(tool_calls):
+                                    # 新工具调用开始，之前的调用参数均已完整，立即执行
+                                    await dispatch_until(len(tool_calls))
+                                    tool_calls.append({
+                                        "id": tool_delta.id,
+                                        "type": "function",
+                                        "function": {
+                                            "name": tool_delta.function.name if tool_delta.function.name else "",
+                                            "arguments": "",
+                                        },
+                                    })
+                                    argument_parts.append([])
+                                    current_tool_call = tool_calls[-1]
+                                    if emit_tool_events:
                                         yield {
                                             "type": "tool_call_start",
                                             "tool_call": {
@@ -114,15 +310,16 @@ class LLMClient:
                                                 "name": tool_delta.function.name if tool_delta.function.name else "",
                                             },
                                         }
-                                    else:
-                                        # 更新现有工具调用
-                                        current_tool_call = tool_calls[tool_delta.index]
+                                else:
+                                    # 更新现有工具调用
+                                    current_tool_call = tool_calls[tool_delta.index]
 
-                                    if tool_delta.function.name:
-                                        current_tool_call["function"]["name"] = tool_delta.function.name
-                                    if tool_delta.function.arguments:
-                                        current_tool_call["function"]["arguments"] += tool_delta.function.arguments
+                                if tool_delta.function.name:
+                                    current_tool_call["function"]["name"] = tool_delta.function.name
+                                if tool_delta.function.arguments:
+                                    argument_parts[tool_delta.index].append(tool_delta.function.arguments)
 
+                                if emit_tool_events:
                                     yield {
                                         "type": "tool_call_delta",
                                         "tool_call": {
@@ -132,94 +329,98 @@ class LLMClient:
                                         },
                                     }
 
-                # 检查是否需要执行工具调用
-                if tool_calls:
+                    # 流结束，最后一个工具调用的参数也已完整
+                    await dispatch_until(len(tool_calls))
+
+                    # 没有工具调用或已是最终响应，结束对话
+                    if not tool_calls or final_round:
+                        return
+
                     # 添加助手消息到历史记录
                     assistant_message = {"role": "assistant", "tool_calls": tool_calls}
+                    if content_parts:
+                        assistant_message["content"] = "".join(content_parts)
                     messages.append(assistant_message)
 
-                    # 处理工具调用
-                    tool_results = []
-                    for tool_call in tool_calls:
-                        tool_name = tool_call["function"]["name"]
-                        self.logger.info(f"🚀 Executing tool: {tool_name}")
-
-                        # 查找完整的工具名称
-                        tool_name_long = None
-                        for chunk in list(tools.values()):
-                            if chunk.get("name") == tool_name:
-                                tool_name_long = f"{chunk.get('server')}:{chunk.get('name')}"
-                                break
-
-                        if not tool_name_long:
-                            tool_result_content = f"Error: Tool '{tool_name}' not found."
-                        else:
-                            try:
-                                tool_args = json.loads(tool_call["function"]["arguments"])
-                                self.logger.info(f"Tool args: {tool_args}")
-
-                                # 修复工具参数
-                                tool_args = fix_tool_args(
-                                    tools=tools,
-                                    tool_args=tool_args,
-                                    tool_name=tool_name_long,
-                                )
-
-                                result = await self.mcp_client.call_tool(
-                                    tool_name=tool_name_long,
-                                    call_params=tool_args
-                                )
-                                tool_result_content = result.model_dump()["content"][0]["text"]
-                            except Exception as e:
-                                tool_result_content = f"Tool execution failed: {str(e)}"
-
-                        # 添加工具结果到历史记录
-                        tool_result = {
-                            "role": "tool",
-                            "content": tool_result_content,
-                            "tool_call_id": tool_call["id"],
-                        }
-                        tool_results.append(tool_result)
-
-                        yield {
-                            "type": "tool_result",
-                            "tool_result": {
-                                "id": tool_call["id"],
-                                "name": tool_name,
-                                "result": tool_result_content,
-                            },
-                        }
-
-                    messages.extend(tool_results)
-                    continue
-                else:
-                    # 没有工具调用，结束对话
-                    return
-
-            # 超过工具调用限制
-            self.logger.error(f"Tool calling limit exceeded: {max_tool_calls}")
-            messages.append({
-                "role": "user",
-                "content": "Error: Maximum tool calling limit reached. Please use the information obtained to provide the final answer."
-            })
-
-            # 最终响应（无工具）
-            with self.client.chat.completions.create(
-                model=self.model_name,
-                messages=messages,
-                stream=True
-            ) as stream:
-                for chunk in stream:
-                    if chunk.choices and chunk.choices[0].delta:
-                        delta = chunk.choices[0].delta
-                        if getattr(delta, "content", None):
-                            yield {"type": "content", "content": delta.content}
+                    # 完成一个即推送一个结果事件，工具结果仍按调用顺序写入历史记录
+                    tool_contents: List[str] = [""] * len(tool_calls)
+                    for next_done in asyncio.as_completed(tool_tasks):
+                        index, tool_result_content = await next_done
+                        tool_contents[index] = tool_result_content
+                        if emit_tool_events:
+                            yield self._tool_result_event(tool_calls[index], tool_result_content)
+                finally:
+                    # 流出错或被中断时取消尚未完成的工具调用
+                    for task in tool_tasks:
+                        task.cancel()
+
+                messages.extend(
+                    {
+                        "role": "tool",
+                        "content": truncate_tool_result(tool_result_content, TOOL_RESULT_HISTORY_CHARS),
+                        "tool_call_id": tool_call["id"],
+                    }
+                    for tool_call, tool_result_content in zip(tool_calls, tool_contents)
+                )
 
         except Exception as e:
             error_message = f"Error calling LLM API: {e}"
-            self.logger.error(error_message, exc_info=True)
+            self.logger.opt(exception=True).error(error_message)
             yield {"type": "error", "error": error_message}
 
+    async def _execute_tool_call(
+        self,
+        tool_call: Dict[str, Any],
+        tools: Dict[str, Any],
+        tool_names: Dict[str, str]
+    ) -> str:
+        """执行单个工具调用，返回工具结果文本（失败时返回错误信息）"""
+        tool_name = tool_call["function"]["name"]
+        self.logger.info("🚀 Executing tool: {}", tool_name)
+
+        # 查找完整的工具名称
+        tool_name_long = tool_names.get(tool_name)
+
+        if not tool_name_long:
+            return f"Error: Tool '{tool_name}' not found."
+
+        try:
+            tool_args = orjson.loads(tool_call["function"]["arguments"])
+            self.logger.info("Tool args: {}", tool_args)
+
+            # 修复工具参数
+            tool_args = fix_tool_args(
+                tools=tools,
+                tool_args=tool_args,
+                tool_name=tool_name_long,
+            )
+
+            result = await self.mcp_client.call_tool(
+                tool_name=tool_name_long,
+                call_params=tool_args
+            )
+            return tool_result_text(result)
+        except Exception as e:
+            return f"Tool execution failed: {str(e)}"
+
+    def _tool_result_event(self, tool_call: Dict[str, Any], tool_result_content: str) -> Dict[str, Any]:
+        """在产生结果处一次性生成截断预览，下游直接转发"""
+        full_length = len(tool_result_content)
+        truncated = full_length > TOOL_RESULT_PREVIEW_CHARS
+        return {
+            "type": "tool_result",
+            "tool_result": {
+                "id": tool_call["id"],
+                "name": tool_call["function"]["name"],
+                "result": (
+                    tool_result_content[:TOOL_RESULT_PREVIEW_CHARS] + "...(已截断)"
+                    if truncated else tool_result_content
+                ),
+                "full_length": full_length,
+                "truncated": truncated,
+            },
+        }
+
     async def process_query_stream(
         self,
         messages: List[Dict[str, Any]],
@@ -227,8 +428,10 @@ class LLMClient:
     ) -> AsyncGenerator[str, None]:
         """
         处理查询并以流式方式返回文本响应，适配FastAPI的StreamingResponse
+
+        只转发文本与错误，因此关闭工具调用事件的生成
         """
-        async for event in self.chat_completion_stream(messages, tools):
+        async for event in self.chat_completion_stream(messages, tools, emit_tool_events=False):
             if event["type"] == "content":
                 yield event["content"]
             elif event["type"] == "error":
@@ -2,16 +2,66 @@
 MCP客户端核心模块,负责处理MCP服务器连接和工具调用
 """
 import os
-import json
+import asyncio
+import hashlib
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
 from datetime import datetime
 
+import orjson
+
 from tools.server_manager import MultiServerManager
 from mcp.types import CallToolResult
 from core.logger import get_logger
 
 
+# 最近一次写入磁盘的工具列表哈希，工具列表未变化时不重复写文件
+_last_tools_dump_hash: Optional[str] = None
+
+
+@lru_cache(maxsize=8)
+def _read_server_config(config_path: str, mtime: float) -> Dict[str, Any]:
+    """读取并解析MCP config文件，按(路径, 修改时间)缓存，文件未修改时不重复读取"""
+    return orjson.loads(Path(config_path).read_bytes())
+
+
+def invalidate_server_configs() -> None:
+    """清除已解析的MCP config缓存，下次创建MCPClient时重新读取文件"""
+    _read_server_config.cache_clear()
+
+
+def _write_tools_dump(path: str, all_tools: Dict[str, Any]) -> None:
+    """将工具列表写入文件（在线程池中执行）"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(orjson.dumps(
+            all_tools,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+            default=str
+        ))
+
+
+# 进程内共享的MCP客户端: MCP配置路径 -> MCPClient，所有会话复用同一组服务器连接
+_SHARED_CLIENTS: Dict[str, "MCPClient"] = {}
+
+
+def get_shared_mcp_client(config_path: str = "./config.json") -> "MCPClient":
+    """获取指定MCP配置的共享客户端，不存在时创建"""
+    client = _SHARED_CLIENTS.get(config_path)
+    if client is None:
+        client = _SHARED_CLIENTS[config_path] = MCPClient(config_path)
+    return client
+
+
+async def close_shared_mcp_clients() -> None:
+    """释放所有共享客户端的长期连接（应用关闭或刷新工具时调用），之后按需重新创建"""
+    clients = list(_SHARED_CLIENTS.values())
+    _SHARED_CLIENTS.clear()
+    await asyncio.gather(*(client.aclose() for client in clients), return_exceptions=True)
+
+
 class MCPClient:
     """MCP客户端类，处理服务器连接和工具调用"""
 
@@ -21,14 +71,62 @@ class MCPClient:
         self.config = self.load_server_configs(config_path)
         self.server_manager = MultiServerManager(server_configs=self.config)
         self.time_stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        # 结果目录在首次写入工具列表时于线程池中创建
         self.result_dir = "./results"
-        os.makedirs(self.result_dir, exist_ok=True)
+
+        # 连接引用计数：并发工具调用共享同一组连接，最后一个使用者负责关闭
+        self._active_users = 0
+        # open()是否持有一个长期引用，直到aclose()释放
+        self._pinned = False
+        self._connection_lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def connected(self) -> AsyncIterator[Dict[str, Any]]:
+        """在代码块执行期间保持MCP服务器连接，返回工具字典"""
+        async with self._connection_lock:
+            if self._active_users == 0:
+                await self.server_manager.connect_all_servers()
+            self._active_users += 1
+
+        try:
+            yield self.server_manager.all_tools
+        finally:
+            async with self._connection_lock:
+                self._active_users -= 1
+                if self._active_users == 0:
+                    await self.server_manager.close_all_connections()
+
+    async def open(self) -> Dict[str, Any]:
+        """保持MCP服务器连接打开，直到调用aclose()；重复调用不会重复连接"""
+        async with self._connection_lock:
+            if not self._pinned:
+                if self._active_users == 0:
+                    await self.server_manager.connect_all_servers()
+                self._active_users += 1
+                self._pinned = True
+        return self.server_manager.all_tools
+
+    async def aclose(self) -> None:
+        """释放open()持有的连接，没有其他使用者时关闭服务器连接"""
+        async with self._connection_lock:
+            if self._pinned:
+                self._pinned = False
+                self._active_users -= 1
+                if self._active_users == 0:
+                    await self.server_manager.close_all_connections()
+
+    async def __aenter__(self) -> "MCPClient":
+        """以async with方式使用时，在整个代码块内保持连接"""
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
 
     def load_server_configs(self, config_path: Path) -> List[Dict[str, Any]]:
         """从MCP config文件加载并转换server配置"""
         try:
-            with open(config_path, "r", encoding="utf-8") as f:
-                cfg = json.load(f)
+            cfg = _read_server_config(str(config_path), os.path.getmtime(config_path))
             servers = []
 
             for name, conf in cfg.get("mcpServers", {}).items():
@@ -61,35 +159,44 @@ class MCPClient:
         """获取所有可用工具"""
         try:
             self.logger.info("🔌 Connecting and discovering tools...")
-            all_tools = await self.server_manager.connect_all_servers()
-
-            # 保存工具列表到文件
-            with open(
-                f"{self.result_dir}/{self.time_stamp}_list_tools.json",
-                "w",
-                encoding="utf-8"
-            ) as file:
-                json.dump(all_tools, file, indent=4, ensure_ascii=False)
+            async with self.connected() as all_tools:
+                # 工具列表变化时才保存到文件，写文件放到线程池避免阻塞事件循环
+                await self._dump_tools(all_tools)
 
-            if not all_tools:
-                raise RuntimeError("No tools discovered.")
-            return all_tools
+                if not all_tools:
+                    raise RuntimeError("No tools discovered.")
+                return all_tools
         except Exception as e:
             self.logger.error(f"Error while connecting MCP Servers: {e}")
             return {}
-        finally:
-            await self.server_manager.close_all_connections()
+
+    async def _dump_tools(self, all_tools: Dict[str, Any]) -> None:
+        """保存工具列表，与上次写入的内容相同时跳过"""
+        global _last_tools_dump_hash
+        dump_hash = hashlib.md5(
+            orjson.dumps(
+                all_tools,
+                option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+                default=str
+            )
+        ).hexdigest()
+        if dump_hash == _last_tools_dump_hash:
+            return
+        _last_tools_dump_hash = dump_hash
+        await asyncio.to_thread(
+            _write_tools_dump,
+            f"{self.result_dir}/{self.time_stamp}_list_tools.json",
+            dict(all_tools)
+        )
 
     async def call_tool(
         self,
         tool_name: Optional[str] = None,
         call_params: Optional[Dict[str, Any]] = None
     ) -> Any:
-        """调用指定工具"""
-        try:
-            self.logger.info("🔌 Connecting and discovering tools...")
-            all_tools = await self.server_manager.connect_all_servers()
-
+        """调用指定工具（处于connected()代码块内时复用已有连接）"""
+        self.logger.info("🔌 Connecting and discovering tools...")
+        async with self.connected() as all_tools:
             if not all_tools:
                 raise RuntimeError("No tools discovered.")
 
@@ -100,10 +207,7 @@ class MCPClient:
 
             self.logger.info(f"🚀 Calling tool: {tool_name}")
             result = await self.server_manager.call_tool(
-                tool_name, call_params or {}, use_cache=False
+                tool_name, call_params or {}, use_cache=False, use_tool_ttl=True
             )
             self.logger.info("✅ Tool call SUCCESS.")
-            return result
-
-        finally:
-            await self.server_manager.close_all_connections()
\ No newline at end of file
+            return result
\ No newline at end of file
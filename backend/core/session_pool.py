@@ -0,0 +1,104 @@
+"""
+会话池模块,负责以LRU + TTL策略管理聊天会话
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from .llm_client import LLMClient
+from core.logger import get_logger
+
+
+class SessionPool:
+    """有界会话池，按最近使用顺序淘汰会话，空闲超过TTL的会话自动过期
+
+    MCP服务器连接由所有会话共享，淘汰会话时无需关闭连接
+    """
+
+    __slots__ = ("maxsize", "ttl", "logger", "_sessions", "_info")
+
+    def __init__(self, maxsize: int = 512, ttl: float = 1800.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.logger = get_logger(__name__)
+        # session_id -> (最近访问时间, LLMClient)，按访问顺序排列
+        self._sessions: "OrderedDict[str, Tuple[float, LLMClient]]" = OrderedDict()
+        # session_id -> 创建时预先计算的会话信息，供观测接口读取
+        self._info: Dict[str, Dict[str, Any]] = {}
+
+    def _purge_expired(self) -> None:
+        """清理过期会话，最早访问的会话位于队首"""
+        now = time.monotonic()
+        while self._sessions:
+            session_id, (last_access, _) = next(iter(self._sessions.items()))
+            if now - last_access < self.ttl:
+                break
+            self._sessions.popitem(last=False)
+            self._info.pop(session_id, None)
+            self.logger.info("Session expired: {}", session_id)
+
+    def get(self, session_id: str) -> Optional[LLMClient]:
+        """获取会话并刷新其访问时间"""
+        self._purge_expired()
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return None
+        self._sessions[session_id] = (time.monotonic(), entry[1])
+        self._sessions.move_to_end(session_id)
+        return entry[1]
+
+    def __contains__(self, session_id: str) -> bool:
+        self._purge_expired()
+        return session_id in self._sessions
+
+    def __getitem__(self, session_id: str) -> LLMClient:
+        chat_client = self.get(session_id)
+        if chat_client is None:
+            raise KeyError(session_id)
+        return chat_client
+
+    def __setitem__(self, session_id: str, chat_client: LLMClient) -> None:
+        self.add(session_id, chat_client)
+
+    def add(
+        self,
+        session_id: str,
+        chat_client: LLMClient,
+        info: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """添加会话，info为创建时计算好的会话信息"""
+        self._purge_expired()
+        self._sessions[session_id] = (time.monotonic(), chat_client)
+        self._sessions.move_to_end(session_id)
+        self._info[session_id] = info or {"session_id": session_id}
+
+        # 超出容量时淘汰最久未使用的会话
+        while len(self._sessions) > self.maxsize:
+            evicted_id, _ = self._sessions.popitem(last=False)
+            self._info.pop(evicted_id, None)
+            self.logger.info("Session evicted (LRU): {}", evicted_id)
+
+    def pop(self, session_id: str) -> Optional[LLMClient]:
+        """移除会话"""
+        self._info.pop(session_id, None)
+        entry = self._sessions.pop(session_id, None)
+        return entry[1] if entry else None
+
+    def items(self) -> Iterator[Tuple[str, LLMClient]]:
+        """遍历未过期的会话"""
+        self._purge_expired()
+        for session_id, (_, chat_client) in list(self._sessions.items()):
+            yield session_id, chat_client
+
+    def infos(self) -> Iterator[Dict[str, Any]]:
+        """遍历会话信息，不访问LLMClient对象"""
+        self._purge_expired()
+        yield from list(self._info.values())
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def clear(self) -> None:
+        """清空会话池"""
+        self._sessions.clear()
+        self._info.clear()
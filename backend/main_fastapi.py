@@ -3,6 +3,7 @@ FastAPI主应用文件
 """
 # TODO REFACTOR FASTAPI BACKEND SERVICE
 import os
+import asyncio
 import logging
 import sys
 from fastapi import FastAPI
@@ -12,7 +13,7 @@ from contextlib import asynccontextmanager
 
 sys.path.append(os.getcwd())
 from config.config_loader import Config
-from backend.api.chat_api import router as chat_router
+from backend.api.chat_api import router as chat_router, close_all_sessions, prefetch_tools
 from core.logger import setup_logging, get_logger
 
 # Initialize global logging system
@@ -30,8 +31,12 @@ logger = get_logger(__name__)
 async def lifespan(app: FastAPI):
     """应用生命周期管理"""
     logger.info("🚀 Starting up FastAPI application...")
+    # 启动时并发预热工具清单，与首个请求的其他准备工作重叠
+    prefetch_task = asyncio.create_task(prefetch_tools())
     yield
     logger.info("📴 Shutting down FastAPI application...")
+    prefetch_task.cancel()
+    await close_all_sessions()
 
 
 # 创建FastAPI应用实例
@@ -76,10 +81,28 @@ if __name__ == "__main__":
 
     logger.info("🌟 Starting IntelliSearch FastAPI server...")
 
+    # 优先使用uvloop事件循环，Windows等不支持的平台回退到asyncio
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        loop = "asyncio"
+
+    # 安装了httptools时使用C实现的HTTP解析器
+    try:
+        import httptools  # noqa: F401
+        http = "httptools"
+    except ImportError:
+        http = "auto"
+
+    # 热重载会额外启动文件监听进程，仅在开发环境(DEV=1)下开启
+    # 会话与MCP连接保存在进程内存中，因此只运行单个worker
     uvicorn.run(
         "backend.main_fastapi:app",
         host="0.0.0.0",
         port=8001,
-        reload=True,
+        reload=os.getenv("DEV") == "1",
+        loop=loop,
+        http=http,
         log_level="info"
     )
\ No newline at end of file
@@ -4,11 +4,14 @@ This module provides the FastAPI service for document indexing and search
 using the refactored txtai-based RAG system.
 """
 
+import asyncio
 import os
 import sys
-from contextlib import asynccontextmanager
-from typing import Optional
+import threading
+from contextlib import asynccontextmanager, suppress
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 from uvicorn import run
 
@@ -21,8 +24,97 @@ from backend.tool_backend.rag_src import RAGService
 logger = get_logger(__name__)
 config = Config(config_file_path="config/config.yaml")
 config.load_config()
+
+# Search defaults are read once at startup instead of on every /search request
+_DEFAULT_LIMIT = config.get_with_env("rag.search.default_limit", 5, env_prefix="RAG")
+_DEFAULT_THRESHOLD = config.get_with_env("rag.search.score_threshold", 0.7, env_prefix="RAG")
+
 rag_service: Optional[RAGService] = None
 
+# The txtai index is not safe for concurrent use, so blocking index operations
+# run in the threadpool one at a time while the event loop keeps serving
+_index_lock = threading.Lock()
+
+
+def _locked(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    with _index_lock:
+        return func(*args, **kwargs)
+
+
+async def _run_index_op(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking RAG index operation off the event loop."""
+    return await run_in_threadpool(_locked, func, *args, **kwargs)
+
+
+# Maximum number of queries embedded together in one batch
+_SEARCH_BATCH_SIZE = 32
+
+
+class SearchBatcher:
+    """Micro-batch concurrent /search requests into one embedding pass.
+
+    Requests are queued and a single background task drains everything that
+    queued up while the previous batch was running, so an idle service adds
+    no latency and a busy one embeds many queries per model call.
+    """
+
+    def __init__(self, service: RAGService, max_batch_size: int = _SEARCH_BATCH_SIZE):
+        self.service = service
+        self.max_batch_size = max_batch_size
+        self._queue: "asyncio.Queue[Tuple[str, Any, Any, asyncio.Future]]" = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start the background batching task on the running loop."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background batching task."""
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def search(self, query: str, limit: Any, threshold: Any) -> Dict[str, Any]:
+        """Queue a search and wait for its batched result."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((query, limit, threshold, future))
+        return await future
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            # Queries sharing limit and threshold go through one batched search
+            groups: Dict[Tuple[Any, Any], List[Tuple[str, asyncio.Future]]] = {}
+            for query, limit, threshold, future in batch:
+                if not future.done():
+                    groups.setdefault((limit, threshold), []).append((query, future))
+
+            for (limit, threshold), items in groups.items():
+                try:
+                    results = await _run_index_op(
+                        self.service.batch_search,
+                        queries=[query for query, _ in items],
+                        limit=limit,
+                        threshold=threshold,
+                    )
+                except Exception as e:
+                    for _, future in items:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+
+                for (_, future), result in zip(items, results):
+                    if not future.done():
+                        future.set_result(result)
+
+
+search_batcher: Optional[SearchBatcher] = None
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -30,7 +122,7 @@ async def lifespan(app: FastAPI):
 
     Initializes the RAG service on startup and cleans up on shutdown.
     """
-    global rag_service
+    global rag_service, search_batcher
 
     logger.info("[RAG Service] Starting up, initializing RAG service...")
 
@@ -51,6 +143,11 @@ async def lifespan(app: FastAPI):
             default="cpu",
             env_prefix="RAG",
         )
+        quantize = config.get_with_env(
+            "rag.embedding.quantize",
+            default=False,
+            env_prefix="RAG",
+        )
         chunk_size = config.get_with_env(
             "rag.documents.chunk_size",
             default=500,
@@ -75,6 +172,7 @@ async def lifespan(app: FastAPI):
             overlap=overlap,
             supported_formats=supported_formats,
             auto_load=True,
+            quantize=quantize,
         )
 
         logger.info("[RAG Service] Service initialized successfully!")
@@ -97,9 +195,14 @@ async def lifespan(app: FastAPI):
         logger.error(f"[RAG Service] Initialization failed: {e}")
         raise e
 
+    search_batcher = SearchBatcher(rag_service)
+    search_batcher.start()
+
     yield
 
     logger.info("[RAG Service] Service shutdown, cleaning up resources...")
+    await search_batcher.stop()
+    search_batcher = None
     rag_service = None
 
 
@@ -157,25 +260,16 @@ async def search_endpoint(request: SearchRequest):
     Returns:
         Search results with scores and content
     """
-    if rag_service is None:
+    if rag_service is None or search_batcher is None:
         raise HTTPException(status_code=503, detail="Service not initialized")
 
     try:
-        # Get default search parameters from config
-        default_limit = config.get_with_env("rag.search.default_limit", 5, env_prefix="RAG")
-        default_threshold = config.get_with_env(
-            "rag.search.score_threshold", 0.7, env_prefix="RAG"
-        )
-
         # Use request params or fall back to config defaults
-        limit = request.limit or default_limit
-        threshold = request.threshold or default_threshold
+        limit = request.limit or _DEFAULT_LIMIT
+        threshold = request.threshold or _DEFAULT_THRESHOLD
 
-        result = rag_service.search(
-            query=request.query,
-            limit=limit,
-            threshold=threshold,
-        )
+        # Concurrent searches are embedded together in one batch
+        result = await search_batcher.search(request.query, limit, threshold)
 
         return result
     except Exception as e:
@@ -198,7 +292,7 @@ async def index_file(file_path: str, save: bool = True):
         raise HTTPException(status_code=503, detail="Service not initialized")
 
     try:
-        result = rag_service.index_file(file_path=file_path, save=save)
+        result = await _run_index_op(rag_service.index_file, file_path=file_path, save=save)
         return result
     except Exception as e:
         logger.error(f"[RAG Service] File indexing failed: {e}")
@@ -221,7 +315,8 @@ async def index_directory(directory_path: str, recursive: bool = True, save: boo
         raise HTTPException(status_code=503, detail="Service not initialized")
 
     try:
-        result = rag_service.index_directory(
+        result = await _run_index_op(
+            rag_service.index_directory,
             directory_path=directory_path,
             recursive=recursive,
             save=save,
@@ -249,7 +344,9 @@ async def delete_documents(request: dict):
         document_ids = request.get("document_ids", [])
         save = request.get("save", True)
 
-        result = rag_service.delete_documents(document_ids=document_ids, save=save)
+        result = await _run_index_op(
+            rag_service.delete_documents, document_ids=document_ids, save=save
+        )
         return result
     except Exception as e:
         logger.error(f"[RAG Service] Document deletion failed: {e}")
@@ -263,7 +360,7 @@ async def save_index():
         raise HTTPException(status_code=503, detail="Service not initialized")
 
     try:
-        rag_service.save_index()
+        await _run_index_op(rag_service.save_index)
         return {"status": "success", "message": "Index saved successfully"}
     except Exception as e:
         logger.error(f"[RAG Service] Index save failed: {e}")
@@ -277,7 +374,7 @@ async def load_index():
         raise HTTPException(status_code=503, detail="Service not initialized")
 
     try:
-        success = rag_service.load_index()
+        success = await _run_index_op(rag_service.load_index)
         if success:
             return {"status": "success", "message": "Index loaded successfully"}
         else:
@@ -294,5 +391,25 @@ if __name__ == "__main__":
     # Get port from configuration with environment variable override support
     # Override via: TOOL_BACKEND_RAG_PORT
     port = config.get_with_env("tool_backend.rag_port", 39257)
+
+    # Prefer uvloop and the httptools parser when they are installed
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        loop = "asyncio"
+    try:
+        import httptools  # noqa: F401
+        http = "httptools"
+    except ImportError:
+        http = "auto"
+
     print(f"[RAG Service] Starting RAG Service on port {port}")
-    run(app, host="0.0.0.0", port=port, log_level="info")
+    run(
+        app,
+        host="0.0.0.0",
+        port=port,
+        loop=loop,
+        http=http,
+        log_level="info",
+    )
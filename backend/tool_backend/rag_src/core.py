@@ -32,6 +32,7 @@ class RAGService:
         overlap: int = 50,
         supported_formats: Optional[List[str]] = None,
         auto_load: bool = True,
+        quantize: bool = False,
     ):
         """
         Initialize the RAG service.
@@ -44,6 +45,7 @@ class RAGService:
             overlap: Overlap between chunks
             supported_formats: List of supported file extensions
             auto_load: If True, automatically load existing index
+            quantize: If True, run the embedding model as INT8-quantized ONNX
         """
         self.logger = logging.getLogger(__name__)
 
@@ -53,6 +55,7 @@ class RAGService:
             index_path=index_path,
             device=device,
             content=True,
+            quantize=quantize,
         )
 
         self.document_processor = DocumentProcessor(
@@ -199,6 +202,38 @@ class RAGService:
                 "error": str(e),
             }
 
+    def batch_search(
+        self,
+        queries: List[str],
+        limit: Optional[int] = None,
+        threshold: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Search for several queries at once, embedding them in one batch.
+
+        Args:
+            queries: Search query texts
+            limit: Maximum number of results per query
+            threshold: Minimum similarity score (0.0 - 1.0)
+
+        Returns:
+            One result dictionary per query, in the same format as ``search``
+        """
+        batches = self.embedding_manager.batch_search(
+            queries=queries,
+            limit=limit,
+            threshold=threshold,
+        )
+        return [
+            {
+                "status": "success",
+                "query": query,
+                "results": results,
+                "count": len(results),
+            }
+            for query, results in zip(queries, batches)
+        ]
+
     def delete_documents(self, document_ids: List[str], save: bool = True) -> Dict[str, Any]:
         """
         Delete documents from the index.
@@ -30,6 +30,7 @@ class EmbeddingManager:
         index_path: str,
         device: str = "cpu",
         content: bool = True,
+        quantize: bool = False,
     ):
         """
         Initialize the EmbeddingManager.
@@ -39,6 +40,8 @@ class EmbeddingManager:
             index_path: Directory path to store/load the vector index
             device: Device to run model on (cpu, mps, cuda)
             content: Whether to store original content in index
+            quantize: If True, run the model as an INT8-quantized ONNX export
+                (requires ``onnx`` and ``onnxruntime``)
         """
         self.index_path = Path(index_path)
         self.content = content
@@ -47,12 +50,18 @@ class EmbeddingManager:
         # Convert model path to absolute path if it's a local path
         model_path = self._resolve_model_path(model_path)
 
+        # Model settings requested by the configuration. A loaded index
+        # restores the model it was built with, so these are kept to detect
+        # a mismatch and to rebuild with the requested model.
+        onnx_path = self._quantized_model_path(model_path) if quantize else None
+        if onnx_path:
+            self._model_config = {"path": onnx_path, "tokenizer": model_path}
+        else:
+            self._model_config = {"path": model_path}
+        self._embeddings_kwargs = dict(self._model_config, content=content, device=device)
+
         # Initialize txtai Embeddings
-        self.embeddings = Embeddings(
-            path=model_path,
-            content=content,
-            device=device,
-        )
+        self.embeddings = Embeddings(**self._embeddings_kwargs)
 
         self._loaded = False
 
@@ -84,6 +93,39 @@ class EmbeddingManager:
 
         return model_path
 
+    def _quantized_model_path(self, model_path: str) -> Optional[str]:
+        """
+        Export the embedding model to an INT8-quantized ONNX file.
+
+        The export is written next to the index directory and reused on later
+        startups. Dynamic INT8 quantization roughly halves memory traffic and
+        speeds up CPU inference for small sentence-transformer models.
+
+        Args:
+            model_path: Resolved model path or HuggingFace model ID
+
+        Returns:
+            Path to the quantized ONNX model, or None if it cannot be built
+        """
+        onnx_path = self.index_path.parent / f"{Path(model_path).name}-int8.onnx"
+        if onnx_path.exists():
+            return str(onnx_path)
+
+        try:
+            from txtai.pipeline import HFOnnx
+        except ImportError as e:
+            self.logger.warning(f"ONNX export unavailable ({e}), using the FP32 model")
+            return None
+
+        try:
+            onnx_path.parent.mkdir(parents=True, exist_ok=True)
+            HFOnnx()(model_path, "pooling", str(onnx_path), quantize=True)
+            self.logger.info(f"Exported quantized embedding model to {onnx_path}")
+            return str(onnx_path)
+        except Exception as e:
+            self.logger.warning(f"Failed to quantize embedding model ({e}), using the FP32 model")
+            return None
+
     def index(self, documents: List[Tuple[str, str, Any]]) -> None:
         """
         Build vector index from documents.
@@ -97,6 +139,14 @@ class EmbeddingManager:
             use upsert() or delete().
         """
         try:
+            # A loaded index may carry a different model than the configured
+            # one; a full rebuild switches to the configured model
+            if self._loaded_model_mismatch():
+                self.logger.info(
+                    f"Rebuilding index with configured model {self._model_config['path']}"
+                )
+                self.embeddings = Embeddings(**self._embeddings_kwargs)
+
             self.embeddings.index(documents)
             self._loaded = True
             self.logger.info(f"Indexed {len(documents)} documents")
@@ -142,6 +192,45 @@ class EmbeddingManager:
             self.logger.error(f"Search failed: {e}")
             return []
 
+    def batch_search(
+        self,
+        queries: List[str],
+        limit: Optional[int] = None,
+        threshold: Optional[float] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search for several queries with a single batched embedding pass.
+
+        Args:
+            queries: Search query texts
+            limit: Maximum number of results to return per query
+            threshold: Minimum similarity score (0.0 - 1.0)
+
+        Returns:
+            One list of search results per query, in the order of ``queries``
+        """
+        if not self._loaded:
+            self.logger.warning("Index not loaded, attempting to load from disk")
+            self.load()
+
+        try:
+            search_params = {}
+            if limit is not None:
+                search_params["limit"] = limit
+
+            batches = self.embeddings.batchsearch(queries, **search_params)
+
+            if threshold is not None:
+                batches = [
+                    [r for r in results if r.get("score", 0) >= threshold]
+                    for results in batches
+                ]
+
+            return batches
+        except Exception as e:
+            self.logger.error(f"Batch search failed: {e}")
+            return [[] for _ in queries]
+
     def upsert(self, documents: List[Tuple[str, str, Any]]) -> None:
         """
         Insert or update documents in the index.
@@ -195,11 +284,35 @@ class EmbeddingManager:
             self.embeddings.load(str(self.index_path))
             self._loaded = True
             self.logger.info(f"Index loaded from {self.index_path}")
+
+            loaded_model = self._loaded_model_mismatch()
+            if loaded_model:
+                self.logger.warning(
+                    f"Index at {self.index_path} was built with model {loaded_model}, "
+                    f"not the configured {self._model_config['path']}. txtai restores "
+                    "the model saved with the index, so searches and upserts keep "
+                    f"using {loaded_model}. Re-index the documents (full rebuild) "
+                    f"or delete {self.index_path} to switch models."
+                )
             return True
         except Exception as e:
             self.logger.error(f"Failed to load index: {e}")
             return False
 
+    def _loaded_model_mismatch(self) -> Optional[str]:
+        """
+        Compare the model of the current txtai config with the configured one.
+
+        Returns:
+            The model path in use if it differs from the configured model
+            (path or tokenizer), otherwise None
+        """
+        config = self.embeddings.config or {}
+        for key, value in self._model_config.items():
+            if config.get(key) != value:
+                return config.get("path")
+        return None
+
     def exists(self) -> bool:
         """Check if index file exists on disk.
 
@@ -29,18 +29,33 @@ from core.factory import AgentFactory
 from core.schema import AgentRequest, AgentResponse
 from core.logger import get_logger
 from config.config_loader import Config
-
-# Initialize global configuration and load environment variables
-config = Config(config_file_path="config/config.yaml")
-config.load_config(override=True)
-
-# Import theme colors
 from ui.theme import ThemeColors
 from ui.tool_ui import ToolUIManager
 from ui.status_manager import get_status_manager
 from ui.loading_messages import get_random_processing_message
 
 
+def init_global_config(config_path: str) -> Config:
+    """
+    Initialize the global configuration once and apply its environment variables.
+
+    Importing this module has no side effects; the configuration is loaded
+    when the first CLI instance is created, from the path it was given.
+
+    Args:
+        config_path: Path to the YAML configuration file
+
+    Returns:
+        The singleton Config instance
+    """
+    try:
+        return Config.get_instance()
+    except RuntimeError:
+        config = Config(config_file_path=config_path)
+        config.load_config(override=True)
+        return config
+
+
 class IntelliSearchCLI:
     """
     Command-line interface for IntelliSearch Agent interactions.
@@ -76,6 +91,9 @@ class IntelliSearchCLI:
         self.config_path = config_path or "config/config.yaml"
         self.logger = get_logger(__name__)
 
+        # Load global configuration and environment variables
+        init_global_config(self.config_path)
+
         # Initialize rich console with theme
         self.console = Console()
 
@@ -191,6 +209,18 @@ class IntelliSearchCLI:
             "system_prompt": self.system_prompt
         }
 
+        # Opt-in memoization of tool results within a conversation
+        if agent_config.get("memoize_servers"):
+            final_config["memoize_servers"] = agent_config["memoize_servers"]
+
+        # Optional token budget for the conversation history
+        if agent_config.get("max_context_tokens"):
+            final_config["max_context_tokens"] = int(agent_config["max_context_tokens"])
+
+        # Optional cap on each tool result kept in the conversation history
+        if agent_config.get("max_tool_result_chars"):
+            final_config["max_tool_result_chars"] = int(agent_config["max_tool_result_chars"])
+
         # Add optional API configuration
         if base_url:
             final_config["base_url"] = base_url
@@ -335,6 +365,9 @@ class IntelliSearchCLI:
                 )
                 return False
 
+            # Release the previous agent's connections when reconfiguring
+            self.close_agent()
+
             self.agent: BaseAgent = AgentFactory.create_agent(
                 agent_type=agent_type, **config
             )
@@ -513,6 +546,7 @@ class IntelliSearchCLI:
                             style=Style(color=ThemeColors.ACCENT),
                         )
                     )
+                    self.close_agent()
                     exit(0)
                 else:
                     self.console.print(
@@ -826,6 +860,16 @@ class IntelliSearchCLI:
                 self.running = False
                 continue
 
+        self.close_agent()
+
+    def close_agent(self) -> None:
+        """Release the agent's open MCP connections before exiting."""
+        if self.agent:
+            try:
+                self.agent.close()
+            except Exception as e:
+                self.logger.error(f"Failed to close agent: {e}")
+
 
 def main():
     """
@@ -192,13 +192,14 @@ class Config:
         if full_env_var_name in os.environ:
             env_value = os.environ[full_env_var_name]
             # Try to convert to appropriate type
-            if isinstance(default, int):
+            # bool is a subclass of int, so it has to be checked first
+            if isinstance(default, bool):
+                return env_value.lower() in ("true", "1", "yes")
+            elif isinstance(default, int):
                 try:
                     return int(env_value)
                 except ValueError:
                     return default
-            elif isinstance(default, bool):
-                return env_value.lower() in ("true", "1", "yes")
             else:
                 return env_value
 
@@ -278,3 +279,23 @@ def get_cache_server_whitelist() -> List[str]:
     """
     config = Config.get_instance()
     return config.get("cache.server_whitelist", [])
+
+
+def get_cache_tool_ttl() -> Dict[str, float]:
+    """Get per-tool cache TTLs.
+
+    Returns:
+        Mapping of "server:tool" or tool name to TTL in seconds
+    """
+    config = Config.get_instance()
+    return config.get("cache.tool_ttl_seconds", None) or {}
+
+
+def get_cache_normalize_args_tools() -> List[str]:
+    """Get tools whose string arguments are normalized before cache lookup.
+
+    Returns:
+        List of "server:tool" or tool names
+    """
+    config = Config.get_instance()
+    return config.get("cache.normalize_args_tools", None) or []
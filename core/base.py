@@ -75,6 +75,15 @@ class BaseAgent(ABC):
         """
         pass
 
+    def close(self) -> None:
+        """
+        Release resources held by the agent (e.g. open tool connections).
+
+        The default implementation does nothing; agents that keep connections
+        alive between inferences override it.
+        """
+        pass
+
     def __repr__(self) -> str:
         """Return string representation of the agent."""
         return f"{self.__class__.__name__}(name='{self.name}')"
@@ -0,0 +1,187 @@
+"""
+Shared OpenAI client helpers for IntelliSearch.
+
+This module builds the HTTP transport used by the async OpenAI-compatible
+clients in the agent layer and the FastAPI backend. The default httpx
+transport degrades quickly once a few dozen requests are in flight, so the
+clients are driven through aiohttp when the ``httpx-aiohttp`` extra is
+installed, falling back to a tuned httpx pool otherwise (speaking HTTP/2
+when the ``h2`` package is available, so concurrent streams share one
+connection).
+
+Clients are cached per (base_url, api_key) so that every agent and chat
+session talking to the same endpoint shares one connection pool.
+"""
+
+import asyncio
+import hashlib
+import importlib.util
+import threading
+from typing import Any, Dict, Optional, Set, Tuple, Union
+from urllib.parse import urlsplit
+
+import httpx
+from openai import AsyncOpenAI, DefaultAioHttpClient, DefaultAsyncHttpxClient
+
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Connection pool limits shared by every LLM client. They size the httpx
+# pool; the aiohttp transport manages its own connector (see make_http_client)
+MAX_CONNECTIONS = 200
+MAX_KEEPALIVE_CONNECTIONS = 100
+
+# Request timeouts (seconds)
+REQUEST_TIMEOUT = 60.0
+CONNECT_TIMEOUT = 10.0
+
+# Only OpenAI itself understands the prompt_cache_key hint
+OPENAI_API_HOST = "api.openai.com"
+
+
+def make_http_client() -> httpx.AsyncClient:
+    """
+    Build the async HTTP client used by AsyncOpenAI instances.
+
+    The pool limits only bind the httpx transport. With aiohttp the SDK
+    builds its own ``aiohttp.TCPConnector``: depending on the httpx-aiohttp
+    version it either ignores the limits (aiohttp's default of 100
+    connections) or maps only ``MAX_CONNECTIONS`` to the connector limit.
+    ``MAX_KEEPALIVE_CONNECTIONS`` has no aiohttp counterpart; idle sockets
+    are reclaimed by the connector's keepalive timeout instead.
+
+    Returns:
+        An httpx.AsyncClient backed by aiohttp when available, otherwise the
+        SDK's default httpx client with enlarged pool limits and HTTP/2
+        enabled if ``h2`` is installed
+    """
+    limits = httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+    )
+    timeout = httpx.Timeout(REQUEST_TIMEOUT, connect=CONNECT_TIMEOUT)
+
+    try:
+        return DefaultAioHttpClient(limits=limits, timeout=timeout)
+    except RuntimeError:
+        # httpx-aiohttp is not installed, keep the pure httpx transport
+        return DefaultAsyncHttpxClient(
+            limits=limits,
+            timeout=timeout,
+            http2=importlib.util.find_spec("h2") is not None,
+        )
+
+
+# (base_url, api_key) -> (event loop the client was created on, client)
+_CLIENT_CACHE: Dict[
+    Tuple[str, str], Tuple[Optional[asyncio.AbstractEventLoop], AsyncOpenAI]
+] = {}
+_CLIENT_CACHE_LOCK = threading.Lock()
+# Strong references to pending close tasks so they are not garbage collected
+_CLOSE_TASKS: Set["asyncio.Task[None]"] = set()
+
+
+async def _close_quietly(client: AsyncOpenAI) -> None:
+    try:
+        await client.close()
+    except Exception as e:
+        logger.debug(f"Failed to close replaced OpenAI client: {e}")
+
+
+def _close_replaced_client(
+    client: AsyncOpenAI,
+    client_loop: Optional[asyncio.AbstractEventLoop],
+    loop: Optional[asyncio.AbstractEventLoop],
+) -> None:
+    """
+    Close a cached client that is being replaced.
+
+    The close runs on the client's own loop while that loop is still alive,
+    otherwise on the current loop so its pooled connections are released.
+
+    Args:
+        client: The client dropped from the cache
+        client_loop: Event loop the client was created on
+        loop: The currently running event loop, if any
+    """
+    if client_loop is not None and client_loop.is_running() and not client_loop.is_closed():
+        asyncio.run_coroutine_threadsafe(_close_quietly(client), client_loop)
+    elif loop is not None:
+        task = loop.create_task(_close_quietly(client))
+        _CLOSE_TASKS.add(task)
+        task.add_done_callback(_CLOSE_TASKS.discard)
+
+
+def get_async_client(base_url: Optional[str], api_key: str) -> AsyncOpenAI:
+    """
+    Get the shared AsyncOpenAI client for an endpoint.
+
+    The underlying connection pool is bound to the event loop it was first
+    used on, so a cached client is only reused on the same running loop and
+    is replaced (and closed) when called from a different one.
+
+    Args:
+        base_url: Base URL of the OpenAI-compatible API (None for the default)
+        api_key: API key used to authenticate
+
+    Returns:
+        Cached AsyncOpenAI client for (base_url, api_key)
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    key = (base_url or "", api_key)
+    with _CLIENT_CACHE_LOCK:
+        cached = _CLIENT_CACHE.get(key)
+        if cached is not None and cached[0] is loop:
+            return cached[1]
+
+        client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            max_retries=2,
+            http_client=make_http_client(),
+        )
+        _CLIENT_CACHE[key] = (loop, client)
+
+    if cached is not None:
+        _close_replaced_client(cached[1], cached[0], loop)
+    return client
+
+
+def prompt_cache_kwargs(
+    base_url: Union[str, httpx.URL], *prefix_parts: str
+) -> Dict[str, Any]:
+    """
+    Build prompt-caching hints for chat completion requests.
+
+    Requests sharing a ``prompt_cache_key`` are routed to the same prefix
+    cache by OpenAI, so every tool round of a conversation reuses the
+    prefilled system prompt and tool schema. Other OpenAI-compatible
+    providers (DeepSeek, GLM, ...) cache identical prefixes on their own and
+    may reject unknown parameters, so the hint is only sent to OpenAI.
+
+    Args:
+        base_url: Resolved base URL of the client (``client.base_url``), so
+            endpoints picked up from ``OPENAI_BASE_URL`` are gated as well
+        *prefix_parts: Strings making up the stable prompt prefix
+
+    Returns:
+        Extra keyword arguments for ``chat.completions.create``
+    """
+    if urlsplit(str(base_url)).hostname != OPENAI_API_HOST:
+        return {}
+    key = hashlib.blake2b(
+        "\x00".join(prefix_parts).encode("utf-8"), digest_size=16
+    ).hexdigest()
+    return {"prompt_cache_key": key}
+
+
+__all__ = [
+    "make_http_client",
+    "get_async_client",
+    "prompt_cache_kwargs",
+]
@@ -107,10 +107,9 @@ class ToolArgumentFixer:
 
         # Stage 2: Simple single parameter mapping
         if len(required_params) == 1 and len(tool_args) == 1:
+            arg_name, arg_value = next(iter(tool_args.items()))
             fixed_args = self._try_single_param_mapping(
-                required_params[0],
-                list(tool_args.keys())[0],
-                list(tool_args.values())[0]
+                required_params[0], arg_name, arg_value
             )
             if fixed_args:
                 return fixed_args
@@ -75,7 +75,7 @@ def search_sai(query: str, conversation_id: str = None):
 
     # Return formatted search results
     result = res.json()
-    return json.dumps(result, ensure_ascii=False, indent=2)
+    return json.dumps(result, ensure_ascii=False, separators=(",", ":"))
 
 
 if __name__ == "__main__":
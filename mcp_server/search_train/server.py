@@ -125,7 +125,7 @@ async def get_stations_code_in_city(city: str) -> str:
     if city not in _CITY_STATIONS:
         return "Error: City not found."
 
-    return json.dumps(_CITY_STATIONS[city], ensure_ascii=False, indent=2)
+    return json.dumps(_CITY_STATIONS[city], ensure_ascii=False, separators=(",", ":"))
 
 
 @mcp.tool()
@@ -150,7 +150,7 @@ async def get_station_code_of_citys(citys: str) -> str:
 
     import json
 
-    return json.dumps(result, ensure_ascii=False, indent=2)
+    return json.dumps(result, ensure_ascii=False, separators=(",", ":"))
 
 
 @mcp.tool()
@@ -174,7 +174,7 @@ async def get_station_code_by_names(station_names: str) -> str:
         else:
             result[name] = _NAME_STATIONS[clean_name]
 
-    return json.dumps(result, ensure_ascii=False, indent=2)
+    return json.dumps(result, ensure_ascii=False, separators=(",", ":"))
 
 
 @mcp.tool()
@@ -250,7 +250,7 @@ async def get_tickets(
         return format_tickets_info_csv(tickets_info)
     elif format == "json":
         return json.dumps(
-            [_ticket_to_dict(t) for t in tickets_info], ensure_ascii=False, indent=2
+            [_ticket_to_dict(t) for t in tickets_info], ensure_ascii=False, separators=(",", ":")
         )
     else:
         return format_tickets_info_text(tickets_info)
@@ -324,7 +324,7 @@ async def get_interline_tickets(
 
         params["result_index"] = str(response["data"].get("result_index", 0))
 
-    return json.dumps(interline_data[:limitedNum], ensure_ascii=False, indent=2)
+    return json.dumps(interline_data[:limitedNum], ensure_ascii=False, separators=(",", ":"))
 
 
 @mcp.tool()
@@ -378,7 +378,7 @@ async def get_train_route_stations(
     route_data = query_response["data"]["data"]
 
     if format == "json":
-        return json.dumps(route_data, ensure_ascii=False, indent=2)
+        return json.dumps(route_data, ensure_ascii=False, separators=(",", ":"))
     else:
         return format_route_stations_text(route_data)
 
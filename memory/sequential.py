@@ -5,12 +5,15 @@ This module provides a simple linear context management implementation
 that maintains messages in the order they were added.
 """
 
-import json
+import orjson
 from typing import List, Dict, Any, Optional
 
 from memory.base import BaseMemory
 from core.logger import get_logger
 
+# Message roles accepted by append_history
+_VALID_ROLES = frozenset({"system", "user", "assistant", "tool"})
+
 
 class SequentialMemory(BaseMemory):
     """
@@ -21,6 +24,8 @@ class SequentialMemory(BaseMemory):
 
     Attributes:
         system_prompt: Initial system prompt to include in memory
+        max_context_tokens: Optional token budget; the oldest conversation
+            turns are evicted once the estimated size exceeds it
         entries: List of memory entries in chronological order
         logger: Logger instance
 
@@ -34,20 +39,30 @@ class SequentialMemory(BaseMemory):
         1
     """
 
-    def __init__(self, system_prompt: Optional[str] = None):
+    def __init__(
+        self,
+        system_prompt: Optional[str] = None,
+        max_context_tokens: Optional[int] = None,
+    ):
         """
         Initialize the SequentialMemory.
 
         Args:
             system_prompt: Optional system prompt to initialize memory with
+            max_context_tokens: Optional budget for the estimated token size
+                of the entries (None keeps the full history)
         """
         self.system_prompt = system_prompt
+        self.max_context_tokens = max_context_tokens
         self.entries: List[Dict[str, Any]] = []
         self.logger = get_logger(__name__)
+        # Running token estimate of self.entries
+        self._token_count = 0
 
         # Initialize with system prompt if provided
         if system_prompt:
             self.entries.append({"role": "system", "content": system_prompt})
+            self._token_count = self._estimate_tokens(self.entries[0])
 
     def reset(self) -> None:
         """
@@ -56,8 +71,10 @@ class SequentialMemory(BaseMemory):
         Clears all entries but preserves the system prompt if it was set.
         """
         self.entries = []
+        self._token_count = 0
         if self.system_prompt:
             self.entries.append({"role": "system", "content": self.system_prompt})
+            self._token_count = self._estimate_tokens(self.entries[0])
         self.logger.info("Memory reset")
 
     def add(self, entry: Any) -> None:
@@ -72,8 +89,70 @@ class SequentialMemory(BaseMemory):
             raise TypeError(f"Entry must be a dict, got {type(entry).__name__}")
 
         self.entries.append(entry)
+        self._token_count += self._estimate_tokens(entry)
         self.logger.debug(f"Added entry: {entry.get('role', 'unknown')}")
 
+        if self.max_context_tokens and self._token_count > self.max_context_tokens:
+            self._evict_oldest_turns()
+
+    @staticmethod
+    def _estimate_tokens(entry: Dict[str, Any]) -> int:
+        """
+        Cheaply estimate the token size of an entry (~4 characters per token).
+
+        Args:
+            entry: Memory entry dictionary
+
+        Returns:
+            Estimated number of tokens
+        """
+        content = entry.get("content") or ""
+        chars = len(content) if isinstance(content, str) else len(str(content))
+        for tool_call in entry.get("tool_calls") or ():
+            function = tool_call.get("function") or {}
+            chars += len(function.get("arguments") or "")
+        return chars // 4 + 1
+
+    def _evict_oldest_turns(self) -> None:
+        """
+        Drop the oldest conversation turns until the token budget is met.
+
+        A turn runs from a user message up to the next one, so assistant tool
+        calls are always evicted together with their tool results. System
+        entries and the latest turn are never evicted. Entries are deleted in
+        place, keeping live views returned by get_view() valid.
+        """
+        evicted = 0
+        while self._token_count > self.max_context_tokens:
+            start = next(
+                (i for i, e in enumerate(self.entries) if e.get("role") != "system"),
+                None,
+            )
+            if start is None:
+                break
+            end = next(
+                (
+                    i
+                    for i in range(start + 1, len(self.entries))
+                    if self.entries[i].get("role") == "user"
+                ),
+                None,
+            )
+            if end is None:
+                # Only the current turn is left
+                break
+
+            self._token_count -= sum(
+                self._estimate_tokens(e) for e in self.entries[start:end]
+            )
+            del self.entries[start:end]
+            evicted += end - start
+
+        if evicted:
+            self.logger.info(
+                f"Evicted {evicted} old entries to fit {self.max_context_tokens} tokens"
+            )
+
     def add_many(self, entries: List[Any]) -> None:
         """
         Add multiple memory entries at once.
@@ -94,7 +173,9 @@ class SequentialMemory(BaseMemory):
             **kwargs: Additional parameters (e.g., max_entries for truncation)
 
         Returns:
-            List of entries in the requested format
+            List of entries in the requested format. Without max_entries this
+            is the live entries list (not a copy), so later add() calls are
+            visible through it.
 
         Raises:
             NotImplementedError: If view_type is not supported
@@ -120,7 +201,7 @@ class SequentialMemory(BaseMemory):
         Returns:
             List of memory entries (JSON-serializable)
         """
-        return json.dumps(self.entries, ensure_ascii=False, indent=2)
+        return orjson.dumps(self.entries, option=orjson.OPT_INDENT_2).decode("utf-8")
 
     def load(self, data: Any) -> None:
         """
@@ -134,7 +215,7 @@ class SequentialMemory(BaseMemory):
         """
         try:
             if isinstance(data, str):
-                entries = json.loads(data)
+                entries = orjson.loads(data)
             elif isinstance(data, list):
                 entries = data
             else:
@@ -146,9 +227,10 @@ class SequentialMemory(BaseMemory):
                 raise ValueError("Parsed data must be a list")
 
             self.entries = entries
+            self._token_count = sum(self._estimate_tokens(e) for e in entries)
             self.logger.info(f"Loaded {len(entries)} entries from data")
 
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON data: {e}") from e
 
     def __len__(self) -> int:
@@ -195,7 +277,7 @@ class SequentialMemory(BaseMemory):
 
         for episode in history_episodes:
             role = episode.get("role")
-            if role and role in ("system", "user", "assistant", "tool"):
+            if role in _VALID_ROLES:
                 self.add(episode)
             else:
                 self.logger.error(f"Invalid role in history: {role}")
@@ -0,0 +1,134 @@
+"""Tests for content coalescing in the chat SSE stream.
+
+    pytest test/test_chat_stream.py -v
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import orjson
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.api import chat_api
+from backend.core import llm_client as llm_client_module
+from backend.core.llm_client import LLMClient
+from core.logger import get_logger
+
+
+class PausingClient:
+    """Streams two content deltas, then pauses until the test resumes it."""
+
+    system_message = {"role": "system", "content": "You are a test assistant."}
+    max_tool_calls = 5
+    logger = get_logger(__name__)
+
+    def __init__(self):
+        self.resume = asyncio.Event()
+
+    async def get_tools(self):
+        return {"demo:echo": {"name": "echo"}}, []
+
+    async def chat_completion_stream(self, messages, tools, max_tool_calls):
+        yield {"type": "content", "content": "hel"}
+        yield {"type": "content", "content": "lo"}
+        await self.resume.wait()
+        yield {"type": "content", "content": " world"}
+
+
+def content_of(frame):
+    event = orjson.loads(frame[len(b"data: "):])
+    return event["content"] if event["type"] == "content" else None
+
+
+class TestContentCoalescing:
+    """Buffered content is flushed on a timer, not only when the next chunk arrives."""
+
+    def test_buffer_flushed_while_upstream_stalls(self):
+        async def scenario():
+            client = PausingClient()
+            contents = []
+            async for frame in chat_api._stream_chat_events(client, "hi"):
+                content = content_of(frame)
+                if content is not None:
+                    contents.append(content)
+                    # Only resume upstream once the stalled buffer was flushed
+                    client.resume.set()
+            return contents
+
+        contents = asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+
+        assert contents == ["hello", " world"]
+
+
+class FakeClock:
+    """Manually advanced stand-in for time.monotonic."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def llm_client(monkeypatch):
+    """LLMClient session with an empty response cache."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    client = LLMClient(model_name="test-model", base_url="http://llm.local/v1")
+    client.system_prompt = "You are a test assistant."
+    return client
+
+
+def stream_twice(client, monkeypatch, event_frames):
+    calls = []
+
+    async def stream_chat_events(chat_client, user_message):
+        calls.append(user_message)
+        for frame in event_frames:
+            yield frame
+
+    monkeypatch.setattr(chat_api, "_stream_chat_events", stream_chat_events)
+
+    async def collect():
+        return [frame async for frame in chat_api.stream_chat_process(client, "hi")]
+
+    first = asyncio.run(collect())
+    second = asyncio.run(collect())
+    return calls, first, second
+
+
+class TestResponseCache:
+    """Identical requests replay cached frames only while fresh and tool-free."""
+
+    def test_plain_answer_is_replayed(self, llm_client, monkeypatch):
+        frames = [chat_api.format_sse_event("content", {"content": "hello"})]
+
+        calls, first, second = stream_twice(llm_client, monkeypatch, frames)
+
+        assert calls == ["hi"]
+        assert first == second == frames
+
+    def test_tool_call_answer_is_not_cached(self, llm_client, monkeypatch):
+        frames = [
+            chat_api.format_sse_event("tool_call_start", {"tool_call": {"name": "echo"}}),
+            chat_api.format_sse_event("content", {"content": "hello"}),
+        ]
+
+        calls, _, _ = stream_twice(llm_client, monkeypatch, frames)
+
+        assert calls == ["hi", "hi"]
+
+    def test_cached_response_expires(self, llm_client, monkeypatch):
+        clock = FakeClock()
+        monkeypatch.setattr(llm_client_module.time, "monotonic", clock)
+        key = llm_client.response_cache_key("hi")
+        llm_client.cache_response(key, [b"frame"])
+
+        clock.now += llm_client_module.RESPONSE_CACHE_TTL - 1
+        assert llm_client.get_cached_response(key) == [b"frame"]
+
+        clock.now += 1
+        assert llm_client.get_cached_response(key) is None
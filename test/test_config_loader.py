@@ -0,0 +1,61 @@
+"""Tests for Config.get_with_env type coercion.
+
+    pytest test/test_config_loader.py -v
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.config_loader import Config
+
+
+CONFIG = """
+rag:
+  embedding:
+    quantize: true
+  search:
+    default_limit: 5
+"""
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    """Fresh Config singleton loaded from a temporary YAML file."""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(CONFIG, encoding="utf-8")
+    monkeypatch.setattr(Config, "_instance", None)
+    monkeypatch.setattr(Config, "_config", None)
+
+    config = Config(config_file_path=str(config_path))
+    config.load_config()
+    return config
+
+
+class TestGetWithEnv:
+    """Environment overrides are coerced to the type of the default."""
+
+    @pytest.mark.parametrize("value", ["false", "0", "no", "False"])
+    def test_false_env_with_bool_default(self, config, monkeypatch, value):
+        monkeypatch.setenv("RAG_RAG_EMBEDDING_QUANTIZE", value)
+
+        assert config.get_with_env("rag.embedding.quantize", False, env_prefix="RAG") is False
+
+    @pytest.mark.parametrize("value", ["true", "1", "yes", "TRUE"])
+    def test_true_env_with_bool_default(self, config, monkeypatch, value):
+        monkeypatch.setenv("RAG_RAG_EMBEDDING_QUANTIZE", value)
+
+        assert config.get_with_env("rag.embedding.quantize", False, env_prefix="RAG") is True
+
+    def test_int_env_with_int_default(self, config, monkeypatch):
+        monkeypatch.setenv("RAG_RAG_SEARCH_DEFAULT_LIMIT", "12")
+
+        assert config.get_with_env("rag.search.default_limit", 5, env_prefix="RAG") == 12
+
+    def test_falls_back_to_config_file(self, config, monkeypatch):
+        monkeypatch.delenv("RAG_RAG_EMBEDDING_QUANTIZE", raising=False)
+
+        assert config.get_with_env("rag.embedding.quantize", False, env_prefix="RAG") is True
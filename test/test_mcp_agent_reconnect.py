@@ -0,0 +1,109 @@
+"""Tests for MCPBaseAgent recovering from failed MCP tool discovery.
+
+The agent pins its MCP connections across queries. When the first connect
+fails or only some servers come up, the next query has to drop that pin and
+connect again instead of keeping the broken state for the whole session.
+
+    pytest test/test_mcp_agent_reconnect.py -v
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.mcp_agent import MCPBaseAgent
+
+
+SERVER_CONFIG = """
+all_servers:
+  demo:
+    command: python
+    args: ["-c", "pass"]
+server_choice:
+  - demo
+"""
+
+DEMO_TOOLS = {
+    "demo:echo": {
+        "name": "echo",
+        "server": "demo",
+        "description": "Echo the input",
+        "input_schema": {"type": "object", "properties": {}},
+    }
+}
+
+
+@pytest.fixture
+def agent(tmp_path, monkeypatch):
+    """Agent whose MCP server fails to connect once, then comes up."""
+    config_path = tmp_path / "servers.yaml"
+    config_path.write_text(SERVER_CONFIG, encoding="utf-8")
+    # Keep tool dumps (data/tools.json) out of the repository
+    monkeypatch.chdir(tmp_path)
+
+    agent = MCPBaseAgent(server_config_path=str(config_path), api_key="test-key")
+    manager = agent.mcp_base.server_manager
+    attempts = []
+
+    async def connect_all_servers():
+        attempts.append(len(attempts) + 1)
+        if len(attempts) == 1:
+            manager.failed_servers = ["demo"]
+        else:
+            manager.failed_servers = []
+            manager.all_tools.update(DEMO_TOOLS)
+        return manager.all_tools
+
+    monkeypatch.setattr(manager, "connect_all_servers", connect_all_servers)
+    agent.connect_attempts = attempts
+    return agent
+
+
+class TestMCPAgentReconnect:
+    """Failed or invalidated discovery reconnects on the next query."""
+
+    def test_failed_first_connect_recovers_on_next_query(self, agent):
+        async def scenario():
+            first_tools, _ = await agent._prepare_tools()
+            second_tools, available_tools = await agent._prepare_tools()
+            await agent.mcp_base.aclose()
+            return first_tools, second_tools, available_tools
+
+        first_tools, second_tools, available_tools = asyncio.run(scenario())
+
+        assert first_tools == {}
+        assert list(second_tools) == ["demo:echo"]
+        assert available_tools[0]["function"]["name"] == "echo"
+        assert agent.connect_attempts == [1, 2]
+
+    def test_successful_discovery_keeps_connections_pinned(self, agent):
+        async def scenario():
+            await agent._prepare_tools()
+            await agent._prepare_tools()
+            tools, _ = await agent._prepare_tools()
+            await agent.mcp_base.aclose()
+            return tools
+
+        tools = asyncio.run(scenario())
+
+        assert list(tools) == ["demo:echo"]
+        # One failed attempt, one reconnect, then the pin is reused
+        assert agent.connect_attempts == [1, 2]
+
+    def test_invalidate_tools_cache_reconnects(self, agent):
+        async def scenario():
+            await agent._prepare_tools()
+            await agent._prepare_tools()
+            agent.invalidate_tools_cache()
+            tools, _ = await agent._prepare_tools()
+            await agent.mcp_base.aclose()
+            return tools
+
+        tools = asyncio.run(scenario())
+
+        assert list(tools) == ["demo:echo"]
+        assert agent.connect_attempts == [1, 2, 3]
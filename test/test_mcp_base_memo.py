@@ -0,0 +1,91 @@
+"""Tests for MCPBase's in-session memo of tool results.
+
+    pytest test/test_mcp_base_memo.py -v
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import orjson
+import pytest
+from mcp.types import CallToolResult, TextContent
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.mcp_base import MCPBase
+from ui.tool_ui import ToolUIManager
+
+
+SERVER_CONFIG = """
+all_servers:
+  demo:
+    command: python
+    args: ["-c", "pass"]
+server_choice:
+  - demo
+"""
+
+TOOLS = {
+    "demo:lookup": {
+        "name": "lookup",
+        "server": "demo",
+        "original_name": "lookup",
+        "input_schema": {"type": "object", "properties": {"q": {"type": "string"}}},
+    }
+}
+
+
+def tool_call(call_id: str) -> dict:
+    return {
+        "id": call_id,
+        "type": "function",
+        "function": {"name": "lookup", "arguments": orjson.dumps({"q": "x"}).decode()},
+    }
+
+
+@pytest.fixture
+def mcp_base(tmp_path, monkeypatch):
+    """MCPBase memoizing the demo server, whose first call fails."""
+    config_path = tmp_path / "servers.yaml"
+    config_path.write_text(SERVER_CONFIG, encoding="utf-8")
+    ToolUIManager.disable()
+
+    mcp_base = MCPBase(config_path=str(config_path), memoize_servers=["demo"])
+    responses = [
+        CallToolResult(content=[TextContent(type="text", text="timeout")], isError=True),
+        CallToolResult(content=[TextContent(type="text", text="answer")]),
+    ]
+    calls = []
+
+    async def get_tool_response(call_params=None, tool_name=None):
+        calls.append(call_params)
+        return responses[min(len(calls), len(responses)) - 1]
+
+    monkeypatch.setattr(mcp_base, "get_tool_response", get_tool_response)
+    mcp_base.calls = calls
+    yield mcp_base
+
+    ToolUIManager.enable()
+
+
+class TestToolMemo:
+    """Only successful results are replayed from the memo."""
+
+    def test_failed_call_is_executed_again(self, mcp_base):
+        async def scenario():
+            outcomes = []
+            for call_id in ("call_1", "call_2", "call_3"):
+                outcomes.append(
+                    await mcp_base.execute_tool_call(tool_call(call_id), TOOLS)
+                )
+            return outcomes
+
+        first, second, third = asyncio.run(scenario())
+
+        assert first["history"]["content"] == "timeout"
+        assert second["history"]["content"] == "answer"
+        # The successful result is memoized, the error was not
+        assert third["history"]["content"] == "answer"
+        assert len(mcp_base.calls) == 2
+        assert third["history"]["tool_call_id"] == "call_3"
@@ -0,0 +1,87 @@
+"""Tests for the shared OpenAI client helpers.
+
+    pytest test/test_openai_client.py -v
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import openai_client
+from core.openai_client import get_async_client, prompt_cache_kwargs
+
+
+@pytest.fixture(autouse=True)
+def empty_client_cache(monkeypatch):
+    """Isolate every test from clients cached by other tests."""
+    monkeypatch.setattr(openai_client, "_CLIENT_CACHE", {})
+
+
+class TestGetAsyncClient:
+    """Clients are shared per loop and closed when replaced."""
+
+    def test_reused_on_same_loop(self):
+        async def scenario():
+            return get_async_client("http://llm.local/v1", "key"), get_async_client(
+                "http://llm.local/v1", "key"
+            )
+
+        first, second = asyncio.run(scenario())
+
+        assert first is second
+
+    def test_client_from_finished_loop_is_closed(self):
+        async def get_client():
+            return get_async_client("http://llm.local/v1", "key")
+
+        async def replace():
+            client = get_async_client("http://llm.local/v1", "key")
+            # Let the scheduled close of the replaced client run
+            await asyncio.sleep(0.05)
+            return client
+
+        first = asyncio.run(get_client())
+        second = asyncio.run(replace())
+
+        assert first is not second
+        assert first.is_closed()
+        assert not second.is_closed()
+
+    def test_client_created_outside_loop_is_closed(self):
+        first = get_async_client("http://llm.local/v1", "key")
+
+        async def replace():
+            client = get_async_client("http://llm.local/v1", "key")
+            await asyncio.sleep(0.05)
+            return client
+
+        second = asyncio.run(replace())
+
+        assert first is not second
+        assert first.is_closed()
+
+
+class TestPromptCacheKwargs:
+    """The prompt_cache_key hint is only sent to api.openai.com."""
+
+    def test_openai_host_gets_hint(self):
+        kwargs = prompt_cache_kwargs("https://api.openai.com/v1/", "system", "tool")
+
+        assert list(kwargs) == ["prompt_cache_key"]
+        assert kwargs == prompt_cache_kwargs("https://api.openai.com/v1/", "system", "tool")
+
+    def test_other_host_gets_no_hint(self):
+        assert prompt_cache_kwargs("https://api.deepseek.com/v1", "system") == {}
+        # Host check, not substring: the OpenAI host in a proxy path does not match
+        assert prompt_cache_kwargs("https://proxy.local/api.openai.com/v1", "system") == {}
+
+    def test_env_base_url_is_gated(self, monkeypatch):
+        monkeypatch.setenv("OPENAI_BASE_URL", "https://open.bigmodel.cn/api/paas/v4")
+
+        client = get_async_client(None, "key")
+
+        assert prompt_cache_kwargs(client.base_url, "system") == {}
@@ -0,0 +1,109 @@
+"""Tests for SearchBatcher micro-batching in the RAG service.
+
+Requires txtai (imported by the RAG service module); skipped otherwise.
+
+    pytest test/test_search_batcher.py -v
+"""
+
+import asyncio
+import importlib
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.config_loader import Config
+
+
+class FakeRAGService:
+    """Records batch_search calls and echoes one result per query."""
+
+    def __init__(self, error=None):
+        self.calls = []
+        self.error = error
+
+    def batch_search(self, queries, limit, threshold):
+        self.calls.append((list(queries), limit, threshold))
+        if self.error is not None:
+            raise self.error
+        return [{"query": query, "limit": limit, "threshold": threshold} for query in queries]
+
+
+@pytest.fixture
+def rag_service_module(tmp_path, monkeypatch):
+    """Import the RAG service module against a minimal config.yaml."""
+    pytest.importorskip("txtai")
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    (config_dir / "config.yaml").write_text("rag: {}\n", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    # The module builds its own Config singleton at import time
+    monkeypatch.setattr(Config, "_instance", None)
+    monkeypatch.setattr(Config, "_config", None)
+    monkeypatch.delitem(sys.modules, "backend.tool_backend.rag_service", raising=False)
+    return importlib.import_module("backend.tool_backend.rag_service")
+
+
+def run_searches(module, service, requests):
+    async def scenario():
+        batcher = module.SearchBatcher(service)
+        batcher.start()
+        try:
+            return await asyncio.gather(
+                *(batcher.search(*request) for request in requests),
+                return_exceptions=True,
+            )
+        finally:
+            await batcher.stop()
+
+    return asyncio.run(scenario())
+
+
+class TestSearchBatcher:
+    """Concurrent searches share batch_search calls and get their own results."""
+
+    def test_concurrent_queries_share_one_call(self, rag_service_module):
+        service = FakeRAGService()
+
+        results = run_searches(
+            rag_service_module,
+            service,
+            [("alpha", 5, 0.7), ("beta", 5, 0.7), ("gamma", 5, 0.7)],
+        )
+
+        assert service.calls == [(["alpha", "beta", "gamma"], 5, 0.7)]
+        assert [result["query"] for result in results] == ["alpha", "beta", "gamma"]
+
+    def test_queries_grouped_by_limit_and_threshold(self, rag_service_module):
+        service = FakeRAGService()
+
+        results = run_searches(
+            rag_service_module,
+            service,
+            [("alpha", 5, 0.7), ("beta", 10, 0.7), ("gamma", 5, 0.7)],
+        )
+
+        assert sorted(service.calls) == [
+            (["alpha", "gamma"], 5, 0.7),
+            (["beta"], 10, 0.7),
+        ]
+        assert [(result["query"], result["limit"]) for result in results] == [
+            ("alpha", 5),
+            ("beta", 10),
+            ("gamma", 5),
+        ]
+
+    def test_batch_error_reaches_every_waiter(self, rag_service_module):
+        service = FakeRAGService(error=RuntimeError("index unavailable"))
+
+        results = run_searches(
+            rag_service_module,
+            service,
+            [("alpha", 5, 0.7), ("beta", 5, 0.7)],
+        )
+
+        assert len(service.calls) == 1
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert [str(result) for result in results] == ["index unavailable"] * 2
@@ -0,0 +1,103 @@
+"""Tests for SequentialMemory's token-budget eviction.
+
+    pytest test/test_sequential_memory.py -v
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from memory.sequential import SequentialMemory
+
+
+SYSTEM_PROMPT = "You are a helpful assistant"
+
+
+def add_tool_turn(memory: SequentialMemory, index: int) -> None:
+    """Add a user turn with an assistant tool call, its result and an answer."""
+    call_id = f"call_{index}"
+    memory.add({"role": "user", "content": f"question {index} " + "q" * 80})
+    memory.add(
+        {
+            "role": "assistant",
+            "tool_calls": [
+                {
+                    "id": call_id,
+                    "type": "function",
+                    "function": {"name": "search", "arguments": '{"query": "x"}'},
+                }
+            ],
+        }
+    )
+    memory.add({"role": "tool", "tool_call_id": call_id, "content": "r" * 400})
+    memory.add({"role": "assistant", "content": f"answer {index} " + "a" * 80})
+
+
+def estimated_total(memory: SequentialMemory) -> int:
+    return sum(memory._estimate_tokens(entry) for entry in memory.entries)
+
+
+class TestTokenBudgetEviction:
+    """Whole turns are evicted, oldest first, until the budget is met."""
+
+    def test_no_orphaned_tool_messages(self):
+        memory = SequentialMemory(system_prompt=SYSTEM_PROMPT, max_context_tokens=300)
+        for index in range(6):
+            add_tool_turn(memory, index)
+
+        issued_call_ids = set()
+        for entry in memory.entries:
+            for tool_call in entry.get("tool_calls") or ():
+                issued_call_ids.add(tool_call["id"])
+            if entry["role"] == "tool":
+                assert entry["tool_call_id"] in issued_call_ids
+
+        # Eviction happened and removed whole turns only
+        assert len(memory.entries) < 1 + 6 * 4
+        assert memory.entries[1]["role"] == "user"
+
+    def test_system_prompt_survives(self):
+        memory = SequentialMemory(system_prompt=SYSTEM_PROMPT, max_context_tokens=200)
+        for index in range(6):
+            add_tool_turn(memory, index)
+
+        assert memory.entries[0] == {"role": "system", "content": SYSTEM_PROMPT}
+        # The latest turn is always kept, even above the budget
+        assert memory.entries[-1]["content"].startswith("answer 5")
+
+    def test_token_count_tracks_entries(self):
+        memory = SequentialMemory(system_prompt=SYSTEM_PROMPT, max_context_tokens=300)
+        for index in range(6):
+            add_tool_turn(memory, index)
+
+        assert memory._token_count == estimated_total(memory)
+
+    def test_eviction_keeps_live_view(self):
+        memory = SequentialMemory(system_prompt=SYSTEM_PROMPT, max_context_tokens=300)
+        view = memory.get_view("chat_messages")
+        for index in range(6):
+            add_tool_turn(memory, index)
+
+        assert view is memory.entries
+
+    def test_without_budget_history_is_kept(self):
+        memory = SequentialMemory(system_prompt=SYSTEM_PROMPT)
+        for index in range(6):
+            add_tool_turn(memory, index)
+
+        assert len(memory) == 1 + 6 * 4
+
+
+class TestClearHistory:
+    """clear_history resets entries and the running token estimate."""
+
+    def test_clear_history_resets_token_count(self):
+        memory = SequentialMemory(system_prompt=SYSTEM_PROMPT, max_context_tokens=300)
+        for index in range(3):
+            add_tool_turn(memory, index)
+
+        memory.clear_history()
+
+        assert memory.entries == [{"role": "system", "content": SYSTEM_PROMPT}]
+        assert memory._token_count == estimated_total(memory)
@@ -0,0 +1,118 @@
+"""Tests for the backend chat SessionPool (LRU + idle TTL).
+
+    pytest test/test_session_pool.py -v
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.core import session_pool as session_pool_module
+from backend.core.session_pool import SessionPool
+
+
+class FakeClock:
+    """Controllable replacement for time.monotonic."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(session_pool_module.time, "monotonic", clock)
+    return clock
+
+
+class TestSessionPoolEviction:
+    """Sessions beyond maxsize are evicted least recently used first."""
+
+    def test_evicts_least_recently_added(self, clock):
+        pool = SessionPool(maxsize=2, ttl=60)
+        pool.add("a", "client-a")
+        pool.add("b", "client-b")
+        pool.add("c", "client-c")
+
+        assert "a" not in pool
+        assert [session_id for session_id, _ in pool.items()] == ["b", "c"]
+        assert [info["session_id"] for info in pool.infos()] == ["b", "c"]
+
+    def test_access_refreshes_lru_position(self, clock):
+        pool = SessionPool(maxsize=2, ttl=60)
+        pool.add("a", "client-a")
+        pool.add("b", "client-b")
+
+        assert pool.get("a") == "client-a"
+        pool.add("c", "client-c")
+
+        assert "b" not in pool
+        assert pool["a"] == "client-a"
+        assert pool["c"] == "client-c"
+
+
+class TestSessionPoolExpiry:
+    """Sessions idle for longer than ttl expire when the pool is accessed."""
+
+    def test_idle_session_expires_on_access(self, clock):
+        pool = SessionPool(maxsize=8, ttl=60)
+        pool.add("a", "client-a", info={"session_id": "a", "model": "m"})
+
+        clock.now += 59
+        assert pool.get("a") == "client-a"
+
+        # get() refreshed the access time, so the window restarts from here
+        clock.now += 59
+        assert "a" in pool
+
+        clock.now += 61
+        assert pool.get("a") is None
+        assert list(pool.infos()) == []
+        assert len(pool) == 0
+
+    def test_expiry_keeps_recently_used_sessions(self, clock):
+        pool = SessionPool(maxsize=8, ttl=60)
+        pool.add("old", "client-old")
+        clock.now += 30
+        pool.add("new", "client-new")
+
+        clock.now += 45
+        assert "old" not in pool
+        assert pool.get("new") == "client-new"
+
+    def test_missing_session_raises_key_error(self, clock):
+        pool = SessionPool(maxsize=8, ttl=60)
+
+        with pytest.raises(KeyError):
+            pool["missing"]
+
+
+class TestSessionPoolRemoval:
+    """Sessions can be removed one at a time or all together."""
+
+    def test_pop_removes_session_and_info(self, clock):
+        pool = SessionPool(maxsize=8, ttl=60)
+        pool.add("a", "client-a", info={"session_id": "a"})
+        pool.add("b", "client-b", info={"session_id": "b"})
+
+        assert pool.pop("a") == "client-a"
+        assert pool.pop("a") is None
+        assert "a" not in pool
+        assert [info["session_id"] for info in pool.infos()] == ["b"]
+
+    def test_clear_removes_everything(self, clock):
+        pool = SessionPool(maxsize=8, ttl=60)
+        pool["a"] = "client-a"
+        pool["b"] = "client-b"
+
+        pool.clear()
+
+        assert len(pool) == 0
+        assert list(pool.items()) == []
+        assert list(pool.infos()) == []
@@ -0,0 +1,60 @@
+"""Tests for ToolCache argument normalization.
+
+    pytest test/test_tool_cache.py -v
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.tool_cache import ToolCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Enabled cache that normalizes arguments for one search tool."""
+    cache = ToolCache(
+        cache_dir=str(tmp_path / "cache"),
+        enabled=True,
+        normalize_args_tools=["web:search"],
+    )
+    yield cache
+    cache.close()
+
+
+class TestNormalizeParams:
+    """Only listed tools share keys across cosmetically different arguments."""
+
+    def test_listed_tool_shares_key(self, cache):
+        first = cache._generate_cache_key("web", "search", {"query": "  Python   Asyncio "})
+        second = cache._generate_cache_key("web", "search", {"query": "python asyncio"})
+
+        assert first == second
+
+    def test_unlisted_tool_keeps_distinct_keys(self, cache):
+        first = cache._generate_cache_key("web", "fetch", {"url": " HTTP://Example.com "})
+        second = cache._generate_cache_key("web", "fetch", {"url": "http://example.com"})
+
+        assert first != second
+
+    def test_same_tool_on_other_server_is_not_normalized(self, cache):
+        first = cache._generate_cache_key("docs", "search", {"query": "Python"})
+        second = cache._generate_cache_key("docs", "search", {"query": "python"})
+
+        assert first != second
+
+    def test_nested_strings_are_normalized(self):
+        params = {"filters": [{"site": " GitHub.COM "}], "query": "A\tB\nC"}
+
+        assert ToolCache._normalize_params(params) == {
+            "filters": [{"site": "github.com"}],
+            "query": "a b c",
+        }
+
+    def test_non_string_values_pass_through(self):
+        params = {"limit": 10, "score": 0.5, "exact": True, "cursor": None, "ids": [1, 2]}
+
+        assert ToolCache._normalize_params(params) == params
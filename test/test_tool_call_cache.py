@@ -0,0 +1,87 @@
+"""Tests for how MultiServerManager.call_tool uses the tool cache.
+
+    pytest test/test_tool_call_cache.py -v
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+from mcp.types import CallToolResult, TextContent
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.server_manager import MultiServerManager
+from tools.tool_cache import ToolCache, set_cache_instance
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    """Manager with one stdio tool that has a per-tool TTL configured."""
+    cache = ToolCache(
+        cache_dir=str(tmp_path / "cache"),
+        enabled=True,
+        tool_ttl_seconds={"echo": 60},
+    )
+    set_cache_instance(cache)
+
+    manager = MultiServerManager(
+        server_configs=[{"name": "demo", "command": ["python", "-c", "pass"]}]
+    )
+    manager.all_tools = {
+        "demo:echo": {"name": "echo", "server": "demo", "original_name": "echo"}
+    }
+    calls = []
+
+    async def call_tool_stdio(connector, tool_name, parameters):
+        calls.append(parameters)
+        return CallToolResult(
+            content=[TextContent(type="text", text=f"echo {parameters['text']}")]
+        )
+
+    monkeypatch.setattr(manager, "_call_tool_stdio", call_tool_stdio)
+    manager.calls = calls
+    yield manager
+
+    cache.close()
+    set_cache_instance(None)
+
+
+def call_twice(manager, **kwargs):
+    async def scenario():
+        first = await manager.call_tool("demo:echo", {"text": "hi"}, **kwargs)
+        second = await manager.call_tool("demo:echo", {"text": "hi"}, **kwargs)
+        return first, second
+
+    return asyncio.run(scenario())
+
+
+class TestCallToolCache:
+    """use_cache=False bypasses the cache unless the caller opts into TTLs."""
+
+    def test_use_cache_false_bypasses_cache(self, manager):
+        call_twice(manager, use_cache=False)
+
+        assert len(manager.calls) == 2
+
+    def test_tool_ttl_opt_in_serves_call_tool_result(self, manager):
+        first, second = call_twice(manager, use_cache=False, use_tool_ttl=True)
+
+        assert len(manager.calls) == 1
+        assert isinstance(second, CallToolResult)
+        assert second.content[0].text == first.content[0].text == "echo hi"
+        # Cached results keep the documented model interface
+        assert second.model_dump()["content"][0]["text"] == "echo hi"
+
+    def test_error_results_are_not_cached(self, manager, monkeypatch):
+        async def failing_call(connector, tool_name, parameters):
+            manager.calls.append(parameters)
+            return CallToolResult(
+                content=[TextContent(type="text", text="upstream timeout")], isError=True
+            )
+
+        monkeypatch.setattr(manager, "_call_tool_stdio", failing_call)
+        call_twice(manager, use_cache=False, use_tool_ttl=True)
+
+        assert len(manager.calls) == 2
@@ -0,0 +1,95 @@
+"""Tests for the pure tool helpers in tools.server_manager.
+
+    pytest test/test_tool_helpers.py -v
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.server_manager import (
+    build_tool_name_index,
+    format_tools_for_openai,
+    truncate_tool_result,
+)
+
+
+TOOLS = {
+    "search_web:search": {
+        "name": "search",
+        "server": "search_web",
+        "description": "Search the web",
+        "input_schema": {"type": "object", "properties": {"q": {"type": "string"}}},
+    },
+    "search_scholar:search": {
+        "name": "search",
+        "server": "search_scholar",
+        "description": "Search papers",
+        "input_schema": {"type": "object", "properties": {}},
+    },
+    "base_toolkit:now": {
+        "name": "now",
+        "server": "base_toolkit",
+        "description": None,
+        "input_schema": None,
+    },
+}
+
+
+class TestTruncateToolResult:
+    """Oversized results keep 2/3 head and 1/3 tail around a marker."""
+
+    def test_short_text_is_unchanged(self):
+        assert truncate_tool_result("hello", 10) == "hello"
+
+    def test_text_at_limit_is_unchanged(self):
+        text = "x" * 30
+        assert truncate_tool_result(text, 30) is text
+
+    def test_head_tail_split_and_marker(self):
+        text = "".join(chr(ord("a") + i % 26) for i in range(100))
+
+        result = truncate_tool_result(text, 30)
+
+        head, marker, tail = result.split("\n")
+        assert head == text[:20]
+        assert tail == text[-10:]
+        assert marker == "...[TRUNCATED 70 chars]..."
+
+    def test_zero_budget_keeps_only_marker(self):
+        result = truncate_tool_result("abcdef", 0)
+
+        assert result == "\n...[TRUNCATED 6 chars]...\n"
+
+
+class TestBuildToolNameIndex:
+    """Short names map to full names; the first discovered server wins."""
+
+    def test_maps_short_to_full_names(self):
+        index = build_tool_name_index(TOOLS)
+
+        assert index == {"search": "search_web:search", "now": "base_toolkit:now"}
+
+    def test_empty_tools(self):
+        assert build_tool_name_index({}) == {}
+
+
+class TestFormatToolsForOpenAI:
+    """Tools become OpenAI function definitions with ``parameters``."""
+
+    def test_function_schema(self):
+        formatted = format_tools_for_openai(TOOLS)
+
+        assert [tool["type"] for tool in formatted] == ["function"] * 3
+        assert formatted[0]["function"] == {
+            "name": "search",
+            "description": "Search the web",
+            "parameters": TOOLS["search_web:search"]["input_schema"],
+        }
+
+    def test_missing_schema_and_description_fall_back(self):
+        function = format_tools_for_openai(TOOLS)[2]["function"]
+
+        assert function["description"] == ""
+        assert function["parameters"] == {"type": "object", "properties": {}}
@@ -6,17 +6,46 @@ including tool discovery, execution, and response handling.
 """
 
 import yaml
-import json
 import os
-from typing import List, Dict, Any, Optional
-
-from tools.server_manager import MultiServerManager
+import asyncio
+import hashlib
+import orjson
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, AsyncIterator
+
+from tools.server_manager import (
+    MultiServerManager,
+    build_tool_name_index,
+    tool_result_is_error,
+    tool_result_text,
+)
 from mcp.types import CallToolResult
 from ui.tool_ui import tool_ui
 from core.tool_hash import fix_tool_args
 from core.logger import get_logger
 
 
+@lru_cache(maxsize=8)
+def _read_yaml_config(config_path: str, mtime: float) -> Dict[str, Any]:
+    """
+    Parse a YAML configuration file, cached by (path, modification time).
+
+    Every agent builds its own MCPBase from the same config file, so the file
+    is only re-read when it changes on disk. The returned dict is shared
+    between callers and must not be mutated.
+
+    Args:
+        config_path: Path to YAML configuration file
+        mtime: Modification time of the file, used as part of the cache key
+
+    Returns:
+        Parsed configuration dictionary
+    """
+    with open(config_path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
 class MCPBase:
     """
     MCP communication component for tool management and execution.
@@ -40,12 +69,18 @@ class MCPBase:
         ... )
     """
 
-    def __init__(self, config_path: str = "config/config.yaml"):
+    def __init__(
+        self,
+        config_path: str = "config/config.yaml",
+        memoize_servers: Optional[List[str]] = None,
+    ):
         """
         Initialize the MCPBase component.
 
         Args:
             config_path: Path to MCP server configuration file (YAML format)
+            memoize_servers: Servers whose tool results are deterministic enough
+                to be reused for identical calls within a session (opt-in)
 
         Raises:
             ValueError: If configuration file is invalid
@@ -54,6 +89,21 @@ class MCPBase:
         self.logger = get_logger(__name__)
         self.config = self._load_server_configs(config_path)
         self.server_manager = MultiServerManager(server_configs=self.config)
+
+        # In-session memo of successful tool results: hash(tool, args) -> text
+        self.memoize_servers = frozenset(memoize_servers or ())
+        self._tool_memo: Dict[str, str] = {}
+
+        # Reference count of callers currently using the server connections
+        self._active_users = 0
+        # Whether open() holds a long-lived reference until aclose()
+        self._pinned = False
+        self._connection_lock: Optional[asyncio.Lock] = None
+        self._connection_lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Hash of the tool list last written to data/tools.json
+        self._tools_dump_hash: Optional[str] = None
+
         self.logger.info("MCPBase initialized")
 
     def _load_server_configs(self, config_path: str) -> List[Dict[str, Any]]:
@@ -73,8 +123,7 @@ class MCPBase:
             FileNotFoundError: If configuration file doesn't exist
             yaml.YAMLError: If YAML parsing fails
         """
-        with open(config_path, "r", encoding="utf-8") as f:
-            cfg: Dict = yaml.safe_load(f)
+        cfg: Dict = _read_yaml_config(config_path, os.path.getmtime(config_path))
 
         servers = []
         all_servers: Dict = cfg.get("all_servers", {})
@@ -128,6 +177,80 @@ class MCPBase:
         )
         return servers
 
+    def _get_connection_lock(self) -> asyncio.Lock:
+        """Get the connection lock for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._connection_lock is None or self._connection_lock_loop is not loop:
+            self._connection_lock = asyncio.Lock()
+            self._connection_lock_loop = loop
+        return self._connection_lock
+
+    @asynccontextmanager
+    async def connected(self) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Keep MCP server connections open for the duration of the block.
+
+        Connections are reference counted: the first caller connects to all
+        servers and the last one to leave closes them, so concurrent tool
+        calls never tear down servers another call is still using.
+
+        Yields:
+            Dictionary mapping tool names to their configurations
+        """
+        async with self._get_connection_lock():
+            await self._acquire()
+
+        try:
+            yield self.server_manager.all_tools
+        finally:
+            async with self._get_connection_lock():
+                await self._release()
+
+    async def _acquire(self) -> None:
+        """Add a connection user, connecting first if none is active. Hold the lock."""
+        if self._active_users == 0:
+            await self.server_manager.connect_all_servers()
+        self._active_users += 1
+
+    async def _release(self) -> None:
+        """Remove a connection user, closing when it was the last. Hold the lock."""
+        self._active_users -= 1
+        if self._active_users == 0:
+            await self.server_manager.close_all_connections()
+
+    async def open(self) -> Dict[str, Any]:
+        """
+        Keep MCP server connections open until ``aclose`` is called.
+
+        Tool discovery and tool calls made in between reuse the live
+        connections instead of reconnecting per call. Calling it again while
+        already open is a no-op.
+
+        Returns:
+            Dictionary mapping tool names to their configurations
+        """
+        async with self._get_connection_lock():
+            if not self._pinned:
+                await self._acquire()
+                self._pinned = True
+        return self.server_manager.all_tools
+
+    async def aclose(self) -> None:
+        """Release the connections held by ``open``."""
+        async with self._get_connection_lock():
+            if self._pinned:
+                self._pinned = False
+                await self._release()
+
+    async def __aenter__(self) -> "MCPBase":
+        """Keep the server connections open for the whole ``async with`` block."""
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        """Release the connections opened by ``__aenter__``."""
+        await self.aclose()
+
     async def list_tools(self) -> Dict[str, Any]:
         """
         Discover and list all available MCP tools.
@@ -137,101 +260,156 @@ class MCPBase:
         """
         try:
             self.logger.info("Discovering MCP tools...")
-            all_tools = await self.server_manager.connect_all_servers()
-            tool_save_path = "data/tools.json"
-            if os.path.exists(tool_save_path):
-                with open(tool_save_path, "w", encoding="utf-8") as file:
-                    json.dump(all_tools, file, ensure_ascii=False, indent=2)
+            async with self.connected() as all_tools:
+                await self._dump_tools(all_tools)
 
-            if not all_tools:
-                raise RuntimeError("No MCP tools discovered")
+                if not all_tools:
+                    raise RuntimeError("No MCP tools discovered")
 
-            return all_tools
+                return all_tools
 
         except Exception as e:
             self.logger.error(f"Failed to discover tools: {e}")
             return {}
-        finally:
-            await self.server_manager.close_all_connections()
 
-    async def execute_tool_calls(
-        self, tool_calls: List[Any], available_tools: Dict[str, Any]
+    async def _dump_tools(self, all_tools: Dict[str, Any]) -> None:
+        """
+        Save the discovered tools to data/tools.json if the file exists.
+
+        The write is skipped when the tool list is unchanged since the last
+        dump, and otherwise runs in a worker thread off the event loop.
+
+        Args:
+            all_tools: Dictionary of discovered tools
+        """
+        tool_save_path = "data/tools.json"
+        if not os.path.exists(tool_save_path):
+            return
+
+        dump_hash = hashlib.md5(
+            orjson.dumps(
+                all_tools,
+                option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+                default=str,
+            )
+        ).hexdigest()
+        if dump_hash == self._tools_dump_hash:
+            return
+        self._tools_dump_hash = dump_hash
+
+        def write() -> None:
+            with open(tool_save_path, "wb") as file:
+                file.write(orjson.dumps(
+                    all_tools,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+                    default=str,
+                ))
+
+        await asyncio.to_thread(write)
+
+    async def execute_tool_call(
+        self,
+        tool_call: Dict[str, Any],
+        available_tools: Dict[str, Any],
+        tool_names: Optional[Dict[str, str]] = None,
     ) -> Dict[str, Any]:
         """
-        Execute multiple tool calls and aggregate results.
+        Execute a single tool call requested by the LLM.
 
         Args:
-            tool_calls: List of tool call objects from LLM
+            tool_call: Tool call in OpenAI message format
+                       ({"id": ..., "function": {"name": ..., "arguments": ...}})
             available_tools: Dictionary of available tools
+            tool_names: Precomputed short name -> full name index (see
+                        build_tool_name_index); built on the fly if omitted
 
         Returns:
-            Dictionary with tools_used list and history entries
+            Dictionary with the tool_used name and its history entry
         """
-        tool_results_for_history = []
-        tools_used = []
-
-        for tool_call in tool_calls:
-            tool_name = tool_call.function.name
-            tool_ui.display_tool_call(tool_name)
-            self.logger.info(f"Executing tool: {tool_call}")
-
-            # Find full tool name
-            tool_name_long = None
-            for tool_info in list(available_tools.values()):
-                if tool_info.get("name") == tool_name:
-                    tool_name_long = (
-                        f"{tool_info.get('server')}:{tool_info.get('name')}"
-                    )
-                    break
-
-            if not tool_name_long:
-                result_text = f"Error: Tool '{tool_name}' not found"
-                tool_ui.display_tool_error(result_text)
-            else:
-                try:
-                    # Parse and fix tool arguments
-                    tool_args = json.loads(tool_call.function.arguments)
-                    self.logger.info(f"Tool arguments: {tool_args}")
-
-                    # Display tool input with styled UI
-                    tool_ui.display_tool_input(tool_name_long, tool_args)
-                    tool_ui.display_execution_status("executing")
-
-                    # Fix tool arguments if needed
-                    tool_args = fix_tool_args(
-                        tools=available_tools,
-                        tool_args=tool_args,
-                        tool_name=tool_name_long,
-                    )
+        tool_name = tool_call["function"]["name"]
+        tool_ui.display_tool_call(tool_name)
+        self.logger.info("Executing tool: {}", tool_call)
+
+        # Find full tool name
+        if tool_names is None:
+            tool_names = build_tool_name_index(available_tools)
+        tool_name_long = tool_names.get(tool_name)
+
+        if not tool_name_long:
+            result_text = f"Error: Tool '{tool_name}' not found"
+            tool_ui.display_tool_error(result_text)
+        else:
+            try:
+                # Parse and fix tool arguments
+                tool_args = orjson.loads(tool_call["function"]["arguments"])
+                self.logger.info("Tool arguments: {}", tool_args)
+
+                # Display tool input with styled UI
+                tool_ui.display_tool_input(tool_name_long, tool_args)
+                tool_ui.display_execution_status("executing")
+
+                # Fix tool arguments if needed
+                tool_args = fix_tool_args(
+                    tools=available_tools,
+                    tool_args=tool_args,
+                    tool_name=tool_name_long,
+                )
 
+                # Reuse the result of an identical earlier call when allowed
+                memo_key = None
+                if self.can_memoize(tool_name_long):
+                    memo_key = hashlib.sha256(
+                        tool_name_long.encode()
+                        + b"|"
+                        + orjson.dumps(tool_args, option=orjson.OPT_SORT_KEYS)
+                    ).hexdigest()
+
+                if memo_key and memo_key in self._tool_memo:
+                    self.logger.info(f"Tool memo hit: {tool_name_long}")
+                    result_text = self._tool_memo[memo_key]
+                else:
                     # Execute tool call
                     result = await self.get_tool_response(
                         call_params=tool_args, tool_name=tool_name_long
                     )
-                    result_text = result.model_dump()["content"][0]["text"]
-
-                    # Display result with styled UI
-                    tool_ui.display_execution_status("completed")
-                    tool_ui.display_tool_result(result_text, max_length=500)
-
-                except Exception as e:
-                    error_msg = f"Tool execution failed: {e}"
-                    tool_ui.display_tool_error(error_msg)
-                    result_text = error_msg
+                    result_text = tool_result_text(result)
+                    # Error results may be transient, so they are never replayed
+                    if memo_key and not tool_result_is_error(result):
+                        self._tool_memo[memo_key] = result_text
+
+                # Display result with styled UI
+                tool_ui.display_execution_status("completed")
+                tool_ui.display_tool_result(result_text, max_length=500)
+
+            except Exception as e:
+                error_msg = f"Tool execution failed: {e}"
+                tool_ui.display_tool_error(error_msg)
+                result_text = error_msg
+
+        return {
+            "tool_used": tool_name_long or tool_name,
+            "history": {
+                "role": "tool",
+                "content": result_text,
+                "tool_call_id": tool_call["id"],
+            },
+        }
+
+    def can_memoize(self, tool_name: str) -> bool:
+        """
+        Check whether results of a tool may be memoized.
 
-            # Record tool call
-            tools_used.append(tool_name_long or tool_name)
+        Args:
+            tool_name: Full tool name in "server:tool" format
 
-            # Add result to history
-            tool_results_for_history.append(
-                {
-                    "role": "tool",
-                    "content": result_text,
-                    "tool_call_id": tool_call.id,
-                }
-            )
+        Returns:
+            True if the tool's server is in memoize_servers
+        """
+        return tool_name.split(":", 1)[0] in self.memoize_servers
 
-        return {"tools_used": tools_used, "history": tool_results_for_history}
+    def clear_memo_cache(self) -> None:
+        """Drop memoized tool results, e.g. at a conversation boundary."""
+        self._tool_memo.clear()
 
     async def get_tool_response(
         self,
@@ -248,10 +426,8 @@ class MCPBase:
         Returns:
             CallToolResult from MCP server
         """
-        try:
-            self.logger.info(f"Connecting to MCP servers to call tool: {tool_name}")
-            all_tools = await self.server_manager.connect_all_servers()
-
+        self.logger.info(f"Connecting to MCP servers to call tool: {tool_name}")
+        async with self.connected() as all_tools:
             if not all_tools:
                 raise RuntimeError("No tools discovered")
 
@@ -259,10 +435,7 @@ class MCPBase:
                 raise ValueError(f"Tool '{tool_name}' not found")
 
             result = await self.server_manager.call_tool(
-                tool_name, call_params or {}, use_cache=False
+                tool_name, call_params or {}, use_cache=False, use_tool_ttl=True
             )
             self.logger.info("Tool call executed successfully")
             return result
-
-        finally:
-            await self.server_manager.close_all_connections()
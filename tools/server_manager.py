@@ -10,6 +10,7 @@ import os
 import aiohttp
 from typing import Dict, List, Any, Optional
 from mcp import ClientSession
+from mcp.types import CallToolResult, TextContent
 from mcp.client.stdio import stdio_client
 from config import config_loader
 from tools.connector import MCPConnector
@@ -26,6 +27,8 @@ class MultiServerManager:
         self.sessions: Dict[str, ClientSession] = {}
         self.clients: Dict[str, Any] = {}
         self.all_tools: Dict[str, Any] = {}
+        # Servers whose last connection attempt failed
+        self.failed_servers: List[str] = []
 
         self.logger.info(
             f"MultiServerManager initialized with {len(server_configs)} server configurations"
@@ -82,10 +85,12 @@ class MultiServerManager:
         results = await asyncio.gather(*connection_tasks, return_exceptions=True)
 
         successful_connections = 0
+        self.failed_servers = []
         for i, result in enumerate(results):
             server_name = self.server_configs[i]["name"]
             if isinstance(result, Exception):
                 self.logger.error(f"Failed to connect to {server_name}: {result}")
+                self.failed_servers.append(server_name)
             else:
                 successful_connections += 1
                 self.all_tools.update(result)
@@ -127,7 +132,7 @@ class MultiServerManager:
                     await session.initialize()
 
                     tools = await connector.discover_tools(session)
-                    self.logger.debug("tools: %s", tools)
+                    self.logger.debug("tools: {}", tools)
 
                     self.sessions[server_name] = None
 
@@ -164,7 +169,7 @@ class MultiServerManager:
                 raise Exception(f"Failed to start HTTP server for {server_name}")
 
             tools = await connector.discover_tools_http()
-            self.logger.debug("tools: %s", tools)
+            self.logger.debug("tools: {}", tools)
 
             return tools
 
@@ -188,7 +193,7 @@ class MultiServerManager:
                 raise Exception(f"Failed to start SSE server for {server_name}")
 
             tools = await connector.discover_tools_sse()
-            self.logger.debug("tools: %s", tools)
+            self.logger.debug("tools: {}", tools)
 
             return tools
 
@@ -209,7 +214,7 @@ class MultiServerManager:
         )
         try:
             tools = await connector.discover_tools_url()
-            self.logger.debug("tools: %s", tools)
+            self.logger.debug("tools: {}", tools)
 
             return tools
 
@@ -222,9 +227,18 @@ class MultiServerManager:
             raise
 
     async def call_tool(
-        self, tool_name: str, parameters: Dict[str, Any], use_cache: bool = True
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        use_cache: bool = True,
+        use_tool_ttl: bool = False,
     ) -> Any:
-        """Calls a tool on the appropriate server by creating a new connection."""
+        """Calls a tool on the appropriate server by creating a new connection.
+
+        ``use_cache=False`` bypasses the tool cache. Callers passing
+        ``use_tool_ttl=True`` still go through the cache for tools that have a
+        per-tool TTL (``cache.tool_ttl_seconds``).
+        """
         if tool_name not in self.all_tools:
             raise ValueError(f"Tool '{tool_name}' not found")
 
@@ -232,17 +246,28 @@ class MultiServerManager:
         server_name = tool_info["server"]
         original_tool_name = tool_info["original_name"]
 
-        # Check cache first if enabled
+        # Check cache first if enabled; callers that opt in also cache the
+        # tools listed with a per-tool TTL
         cache = get_cache()
+        if not use_cache and use_tool_ttl:
+            use_cache = cache.tool_ttl(server_name, original_tool_name) is not None
         if use_cache and cache.enabled:
             cached_result = cache.get(server_name, original_tool_name, parameters)
             if cached_result is not None:
+                # CallToolResults are cached as their text; return the same type
+                if isinstance(cached_result, str):
+                    return CallToolResult(
+                        content=[TextContent(type="text", text=cached_result)]
+                    )
                 return cached_result
 
         connector = self.connectors[server_name]
 
-        self.logger.info(
-            f"Calling tool '{original_tool_name}' on server '{server_name}' with params: {json.dumps(parameters,ensure_ascii=False)}"
+        self.logger.opt(lazy=True).info(
+            "Calling tool '{}' on server '{}' with params: {}",
+            lambda: original_tool_name,
+            lambda: server_name,
+            lambda: json.dumps(parameters, ensure_ascii=False),
         )
 
         if connector.transport_type == "http":
@@ -271,9 +296,19 @@ class MultiServerManager:
         # Store in cache if successful and enabled
         # Additional validation before caching
         if use_cache and cache.enabled:
+            # CallToolResult models are cached as their text; error results never are
+            cache_value = result
+            if hasattr(result, "content"):
+                try:
+                    cache_value = (
+                        None if tool_result_is_error(result) else tool_result_text(result)
+                    )
+                except (AttributeError, IndexError):
+                    cache_value = None
+
             # Only cache if result is valid and not empty
-            if result and result != {} and result != []:
-                cache.set(server_name, original_tool_name, parameters, result)
+            if cache_value and cache_value != {} and cache_value != []:
+                cache.set(server_name, original_tool_name, parameters, cache_value)
             else:
                 self.logger.debug(
                     f"Skipping cache for empty/invalid result from {server_name}:{original_tool_name}"
@@ -386,7 +421,11 @@ class MultiServerManager:
 
         # Stop all HTTP/SSE/URL servers concurrently for faster cleanup
         server_cleanup_tasks = []
+        # Server name of each cleanup task, in the same order
+        cleanup_server_names = []
         for server_name, connector in self.connectors.items():
+            if connector.transport_type in ("http", "sse"):
+                cleanup_server_names.append(server_name)
             if connector.transport_type == "http":
                 if connector.server_url:
                     self.logger.info(f"Scheduling cleanup for URL server {server_name}")
@@ -420,14 +459,15 @@ class MultiServerManager:
             )
 
             # Log any cleanup failures
-            for i, result in enumerate(results):
+            for server_name, result in zip(cleanup_server_names, results):
                 if isinstance(result, Exception):
-                    server_name = list(self.connectors.keys())[i]
                     self.logger.error(f"Failed to cleanup server {server_name}: {result}")
 
-        # Clear references
+        # Clear references; rebind the tool dict since callers may still hold
+        # the previous one, and the next connect rediscovers from scratch
         self.sessions.clear()
         self.clients.clear()
+        self.all_tools = {}
         self.logger.info("All MCP server connections closed")
 
     async def _cleanup_http_server(self, server_name: str, connector):
@@ -462,3 +502,118 @@ class MultiServerManager:
 
             self.logger.error(f"Full traceback: {traceback.format_exc()}")
             raise
+
+
+def tool_result_text(result: Any) -> str:
+    """
+    Extract the first text block of a tool call result.
+
+    Reads attributes directly instead of serializing the whole result model,
+    and also accepts the plain dicts/strings returned by HTTP servers and
+    the tool cache.
+
+    Args:
+        result: CallToolResult, JSON-RPC result dict or cached string
+
+    Returns:
+        Text content of the first content block
+    """
+    if isinstance(result, dict):
+        return result["content"][0]["text"]
+    if isinstance(result, str):
+        return result
+    return result.content[0].text
+
+
+def tool_result_is_error(result: Any) -> bool:
+    """
+    Check whether a tool call result reports a tool-level error.
+
+    Accepts both the ``isError`` attribute of mcp 1.x and the ``is_error``
+    attribute of mcp 2.x, as well as JSON-RPC result dicts.
+
+    Args:
+        result: CallToolResult or JSON-RPC result dict
+
+    Returns:
+        True if the result is flagged as an error
+    """
+    if isinstance(result, dict):
+        return bool(result.get("isError", False))
+    is_error = getattr(result, "isError", None)
+    if is_error is None:
+        is_error = getattr(result, "is_error", False)
+    return bool(is_error)
+
+
+def build_tool_name_index(tools: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Map the short tool names shown to the LLM to full "server:tool" names.
+
+    Built once per tool discovery so each tool call resolves its name with a
+    dict lookup instead of scanning every tool. When several servers expose
+    the same short name, the first discovered one wins.
+
+    Args:
+        tools: Discovered tools keyed by full name
+
+    Returns:
+        Dictionary mapping short tool names to full tool names
+    """
+    index: Dict[str, str] = {}
+    for tool_info in tools.values():
+        index.setdefault(
+            tool_info.get("name"), f"{tool_info.get('server')}:{tool_info.get('name')}"
+        )
+    return index
+
+
+def format_tools_for_openai(tools: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Convert discovered MCP tools to the OpenAI function-calling schema.
+
+    The MCP input schema is sent as ``parameters``, the field OpenAI-compatible
+    APIs read for native tool calling. Callers build this list once per tool
+    discovery and pass the same list to every request.
+
+    Args:
+        tools: Discovered tools keyed by full name
+
+    Returns:
+        List of tool definitions for ``chat.completions.create(tools=...)``
+    """
+    return [
+        {
+            "type": "function",
+            "function": {
+                "name": tool.get("name"),
+                "description": tool.get("description") or "",
+                "parameters": tool.get("input_schema")
+                or {"type": "object", "properties": {}},
+            },
+        }
+        for tool in tools.values()
+    ]
+
+
+def truncate_tool_result(text: str, max_chars: int) -> str:
+    """
+    Bound a tool result before it is added to the conversation history.
+
+    Tool results are re-sent to the LLM on every later round, so oversized
+    results are cut down to their head and tail around a marker giving the
+    number of omitted characters.
+
+    Args:
+        text: Tool result text
+        max_chars: Maximum number of characters to keep
+
+    Returns:
+        The text unchanged if it fits, otherwise its truncated form
+    """
+    if len(text) <= max_chars:
+        return text
+    head = max_chars * 2 // 3
+    tail = max_chars - head
+    omitted = len(text) - head - tail
+    return f"{text[:head]}\n...[TRUNCATED {omitted} chars]...\n{text[len(text) - tail:]}"
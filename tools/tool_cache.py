@@ -6,6 +6,8 @@ Implements tool call caching with multi-process safe access
 
 import json
 import hashlib
+import orjson
+import re
 import time
 import sqlite3
 import threading
@@ -13,6 +15,9 @@ from pathlib import Path
 from typing import Any, Dict, Optional
 from core.logger import get_logger
 
+# Runs of whitespace collapsed when normalizing string arguments
+_WHITESPACE_RE = re.compile(r"\s+")
+
 
 
 class ToolCache:
@@ -26,6 +31,8 @@ class ToolCache:
         ttl_hours: int = 0,
         enabled: bool = False,
         server_whitelist: Optional[list] = None,
+        tool_ttl_seconds: Optional[Dict[str, float]] = None,
+        normalize_args_tools: Optional[list] = None,
     ):
         """
         Initialize the cache system
@@ -35,6 +42,13 @@ class ToolCache:
             ttl_hours: Cache time-to-live in hours, 0 means permanent cache
             enabled: Whether caching is enabled
             server_whitelist: Server whitelist, only cache tool calls from these servers (None or empty list means cache all)
+            tool_ttl_seconds: Per-tool TTL in seconds keyed by "server:tool" or tool name.
+                Listed tools are cached with their own TTL regardless of the server whitelist,
+                including for callers that bypass the cache but opt in with use_tool_ttl
+                (0 means permanent)
+            normalize_args_tools: Tools ("server:tool" or tool name) whose string arguments are
+                stripped, casefolded and whitespace-collapsed before hashing, so cosmetically
+                different calls share a cache entry
         """
         self.logger = get_logger(__name__)
         self.enabled = enabled
@@ -47,6 +61,8 @@ class ToolCache:
         self.db_path = self.cache_dir / "tool_cache.db"
         self.ttl_seconds = ttl_hours * 3600 if ttl_hours > 0 else 0
         self.server_whitelist = server_whitelist or []
+        self.tool_ttl_seconds = tool_ttl_seconds or {}
+        self.normalize_args_tools = frozenset(normalize_args_tools or ())
 
         # Thread-local storage, one connection per thread
         self.local = threading.local()
@@ -110,12 +126,55 @@ class ToolCache:
         Returns:
             Cache key
         """
+        if (
+            f"{server_name}:{tool_name}" in self.normalize_args_tools
+            or tool_name in self.normalize_args_tools
+        ):
+            params = self._normalize_params(params)
+
         # Normalize and sort parameters to ensure same params generate same key
         normalized_params = json.dumps(params, sort_keys=True,ensure_ascii=False)
         key_string = f"{server_name}:{tool_name}:{normalized_params}"
         cache_key = hashlib.md5(key_string.encode()).hexdigest()
         return cache_key
 
+    def tool_ttl(self, server_name: str, tool_name: str) -> Optional[float]:
+        """
+        Get the per-tool TTL configured for a tool
+
+        Args:
+            server_name: Server name
+            tool_name: Tool name
+
+        Returns:
+            TTL in seconds, or None if the tool has no per-tool TTL
+        """
+        if not self.enabled or not self.tool_ttl_seconds:
+            return None
+        ttl = self.tool_ttl_seconds.get(f"{server_name}:{tool_name}")
+        if ttl is None:
+            ttl = self.tool_ttl_seconds.get(tool_name)
+        return ttl
+
+    @classmethod
+    def _normalize_params(cls, value: Any) -> Any:
+        """
+        Normalize argument values that only differ cosmetically
+
+        Args:
+            value: Tool parameters or a nested value
+
+        Returns:
+            Value with strings stripped, casefolded and whitespace-collapsed
+        """
+        if isinstance(value, str):
+            return _WHITESPACE_RE.sub(" ", value.strip()).casefold()
+        if isinstance(value, dict):
+            return {key: cls._normalize_params(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [cls._normalize_params(item) for item in value]
+        return value
+
     def get(
         self, server_name: str, tool_name: str, params: Dict[str, Any]
     ) -> Optional[Any]:
@@ -133,9 +192,11 @@ class ToolCache:
         if not self.enabled:
             return None
 
-        # Check if server is in whitelist
-        if self.server_whitelist and server_name not in self.server_whitelist:
+        # Check if server is in whitelist (tools with a per-tool TTL are always cacheable)
+        tool_ttl = self.tool_ttl(server_name, tool_name)
+        if tool_ttl is None and self.server_whitelist and server_name not in self.server_whitelist:
             return None
+        ttl_seconds = self.ttl_seconds if tool_ttl is None else tool_ttl
 
         cache_key = self._generate_cache_key(server_name, tool_name, params)
         current_time = time.time()
@@ -150,7 +211,7 @@ class ToolCache:
             if row:
                 result_json, timestamp = row
                 # Check if expired (ttl_seconds=0 means never expire)
-                if self.ttl_seconds == 0 or current_time - timestamp < self.ttl_seconds:
+                if ttl_seconds == 0 or current_time - timestamp < ttl_seconds:
                     # Update access count
                     conn.execute(
                         "UPDATE cache SET access_count = access_count + 1 WHERE cache_key = ?",
@@ -158,12 +219,15 @@ class ToolCache:
                     )
                     conn.commit()
 
-                    result = json.loads(result_json)
+                    result = orjson.loads(result_json)
                     age_minutes = (current_time - timestamp) / 60
                     self.logger.info(
                         f"Cache HIT: {server_name}:{tool_name} (age: {age_minutes:.1f} minutes)"
                     )
-                    self.logger.info(f"  Cached params: {json.dumps(params, indent=2, ensure_ascii=False)}")
+                    self.logger.opt(lazy=True).info(
+                        "  Cached params: {}",
+                        lambda: json.dumps(params, indent=2, ensure_ascii=False),
+                    )
                     return result
                 else:
                     # Expired, delete it
@@ -171,11 +235,13 @@ class ToolCache:
                     conn.commit()
                     self.logger.debug(f"Cache expired: {server_name}:{tool_name}")
 
-        except (sqlite3.Error, json.JSONDecodeError) as e:
+        except (sqlite3.Error, orjson.JSONDecodeError) as e:
             self.logger.error(f"Cache read error: {e}")
 
         self.logger.info(f"Cache MISS: {server_name}:{tool_name}")
-        self.logger.debug(f"  Params: {json.dumps(params, indent=2,ensure_ascii=False)}")
+        self.logger.opt(lazy=True).debug(
+            "  Params: {}", lambda: json.dumps(params, indent=2, ensure_ascii=False)
+        )
         return None
 
     def set(
@@ -196,8 +262,12 @@ class ToolCache:
         if not self.enabled:
             return False
 
-        # Check if server is in whitelist
-        if self.server_whitelist and server_name not in self.server_whitelist:
+        # Check if server is in whitelist (tools with a per-tool TTL are always cacheable)
+        if (
+            self.tool_ttl(server_name, tool_name) is None
+            and self.server_whitelist
+            and server_name not in self.server_whitelist
+        ):
             self.logger.info(
                 f"Server '{server_name}' not in cache whitelist {self.server_whitelist}, skipping cache"
             )
@@ -251,8 +321,12 @@ class ToolCache:
         cache_key = self._generate_cache_key(server_name, tool_name, params)
 
         try:
-            result_json = json.dumps(result, default=str, ensure_ascii=False)
-            params_json = json.dumps(params, sort_keys=True, ensure_ascii=False)
+            result_json = orjson.dumps(
+                result, option=orjson.OPT_NON_STR_KEYS, default=str
+            ).decode()
+            params_json = orjson.dumps(
+                params, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str
+            ).decode()
 
             conn = self._get_connection()
             conn.execute(
@@ -276,10 +350,12 @@ class ToolCache:
             self.logger.info(
                 f"Cache SET: {server_name}:{tool_name} (size: {result_size} bytes)"
             )
-            self.logger.debug(f"  Params: {json.dumps(params, indent=2,ensure_ascii=False)}")
+            self.logger.opt(lazy=True).debug(
+                "  Params: {}", lambda: json.dumps(params, indent=2, ensure_ascii=False)
+            )
             return True
 
-        except (sqlite3.Error, json.JSONEncodeError) as e:
+        except (sqlite3.Error, orjson.JSONEncodeError) as e:
             self.logger.error(f"Cache write error: {e}")
             return False
 
@@ -427,6 +503,8 @@ def get_cache(**kwargs) -> ToolCache:
                 "cache_dir": config_loader.get_cache_dir(),
                 "ttl_hours": config_loader.get_cache_ttl(),
                 "server_whitelist": config_loader.get_cache_server_whitelist(),
+                "tool_ttl_seconds": config_loader.get_cache_tool_ttl(),
+                "normalize_args_tools": config_loader.get_cache_normalize_args_tools(),
             }
 
         _cache_instance = ToolCache(**kwargs)
@@ -1,4 +1,4 @@
-import json
+import orjson
 from typing import Dict, Any
 from rich.console import Console
 from rich.panel import Panel
@@ -69,7 +69,7 @@ class ToolCallUI:
         table.add_row("Tool", tool_name)
 
         # Format arguments
-        args_str = json.dumps(arguments, indent=2, ensure_ascii=False)
+        args_str = orjson.dumps(arguments, option=orjson.OPT_INDENT_2, default=str).decode()
         table.add_row("Arguments", Text(args_str, style=Style(color=ThemeColors.DIM)))
 
         self.console.print(
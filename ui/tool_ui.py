@@ -6,6 +6,7 @@ information with a consistent visual style across the application.
 """
 
 from typing import Optional, Dict, Any
+import orjson
 from rich.console import Console
 from rich.text import Text
 from rich.panel import Panel
@@ -121,8 +122,7 @@ class ToolUIManager:
         table.add_row("Tool", tool_name)
 
         # Format arguments
-        import json
-        args_str = json.dumps(arguments, indent=2, ensure_ascii=False)
+        args_str = orjson.dumps(arguments, option=orjson.OPT_INDENT_2, default=str).decode()
         table.add_row("Arguments", Text(args_str, style=Style(color=ThemeColors.DIM)))
 
         self._console.print(
@@ -183,8 +183,9 @@ class ToolUIManager:
         title.append("Result", style=Style(color=ThemeColors.TOOL_SECONDARY))
 
         # Truncate if too long
-        if len(result) > max_length:
-            truncated = result[:max_length] + f"...(truncated, full length: {len(result)} chars)"
+        result_length = len(result)
+        if result_length > max_length:
+            truncated = result[:max_length] + f"...(truncated, full length: {result_length} chars)"
             result_text = Text(truncated, style=Style(color=ThemeColors.FG))
         else:
             result_text = Text(result, style=Style(color=ThemeColors.FG))